@@ -8,8 +8,72 @@ License: MIT
 import os
 import json
 import sys
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Directories that never contain shipped scripts
+SKIP_DIRS = {'tests', 'test', '.git', '__pycache__', '.venv', 'venv', '.tox', '.nox',
+             '.mypy_cache', '.pytest_cache', '.ruff_cache', 'build', 'dist'}
+
+# Display order of the script categories; other directories follow alphabetically
+CATEGORY_ORDER = ('network', 'web', 'crypto', 'automation')
+
+# Read size used when counting lines
+CHUNK_SIZE = 1 << 20
+
+# Line counting is IO-bound; reads release the GIL so threads overlap them
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def count_lines(path) -> int:
+    """Count newlines in a file by scanning raw bytes in fixed-size chunks."""
+    total = 0
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        while True:
+            chunk = os.read(fd, CHUNK_SIZE)
+            if not chunk:
+                break
+            total += chunk.count(b'\n')
+    finally:
+        os.close(fd)
+    return total
+
+def find_script_files(root):
+    """Return script paths under root and the newest mtime among them, pruning skipped dirs."""
+    paths = []
+    newest = 0
+    pending = [os.fspath(root)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and not entry.name.endswith('.egg-info'):
+                            pending.append(entry.path)
+                    elif entry.name.endswith('.py') and not entry.name.startswith('test_'):
+                        paths.append(entry.path)
+                        newest = max(newest, entry.stat().st_mtime_ns)
+        except OSError:
+            pass
+    paths.sort()
+    return tuple(paths), newest
+
+@functools.lru_cache(maxsize=8)
+def count_tree_lines(paths, newest_mtime_ns) -> int:
+    """Total line count of the given files, cached on the file set and newest mtime."""
+    if not paths:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(paths))) as executor:
+        return sum(executor.map(_count_lines_or_zero, paths))
+
+def _count_lines_or_zero(path) -> int:
+    """Line count of a file, treating unreadable files as empty."""
+    try:
+        return count_lines(path)
+    except OSError:
+        return 0
+
 class RepositorySummary:
     """Generate comprehensive repository statistics and capabilities."""
     
@@ -25,28 +89,31 @@ class RepositorySummary:
     
     def analyze_repository(self):
         """Analyze the repository structure and capabilities."""
-        # Count files by category
-        categories = ['network', 'web', 'crypto', 'automation']
+        # Count files by category, one scandir per category directory
+        try:
+            with os.scandir(self.repo_path / 'scripts') as entries:
+                category_dirs = [e for e in entries if e.is_dir() and e.name not in SKIP_DIRS]
+            category_dirs.sort(key=lambda e: (CATEGORY_ORDER.index(e.name)
+                                              if e.name in CATEGORY_ORDER else len(CATEGORY_ORDER), e.name))
+        except OSError:
+            category_dirs = []
         
-        for category in categories:
-            category_path = self.repo_path / 'scripts' / category
-            if category_path.exists():
-                scripts = list(category_path.glob('*.py'))
-                self.stats['categories'][category] = {
-                    'scripts': len(scripts),
-                    'files': [s.name for s in scripts]
-                }
+        for category in category_dirs:
+            try:
+                with os.scandir(category.path) as entries:
+                    scripts = [e.name for e in entries
+                               if e.name.endswith('.py') and e.is_file(follow_symlinks=False)]
+            except OSError:
+                continue
+            self.stats['categories'][category.name] = {
+                'scripts': len(scripts),
+                'files': scripts
+            }
         
-        # Count total files and lines
-        for py_file in self.repo_path.rglob('*.py'):
-            if 'test' not in str(py_file):
-                self.stats['total_files'] += 1
-                try:
-                    with open(py_file, 'r', encoding='utf-8') as f:
-                        lines = len(f.readlines())
-                        self.stats['total_lines'] += lines
-                except Exception:
-                    pass
+        # Count total files and lines; unchanged trees reuse the cached count
+        paths, newest_mtime_ns = find_script_files(self.repo_path)
+        self.stats['total_files'] = len(paths)
+        self.stats['total_lines'] = count_tree_lines(paths, newest_mtime_ns)
         
         # Define capabilities
         self.stats['capabilities'] = [
@@ -8,8 +8,20 @@ License: MIT
 import json
 import time
 import argparse
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List
+
+try:
+    import orjson
+except ImportError:  # Optional, see requirements.txt
+    orjson = None
+
+def dumps_report(report):
+    """Serialize a report to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2, default=str, ensure_ascii=False).encode('utf-8')
 
 class SecurityReportGenerator:
     """Generate comprehensive security reports."""
@@ -32,15 +44,14 @@ class SecurityReportGenerator:
     
     def generate_summary(self) -> Dict:
         """Generate executive summary."""
-        total_vulns = len(self.report_data['vulnerabilities'])
-        critical = sum(1 for v in self.report_data['vulnerabilities'] 
-                       if v.get('results', {}).get('severity') == 'critical')
-        high = sum(1 for v in self.report_data['vulnerabilities'] 
-                  if v.get('results', {}).get('severity') == 'high')
-        medium = sum(1 for v in self.report_data['vulnerabilities'] 
-                    if v.get('results', {}).get('severity') == 'medium')
-        low = sum(1 for v in self.report_data['vulnerabilities'] 
-                 if v.get('results', {}).get('severity') == 'low')
+        # One pass over the findings, so entries appended directly are counted too
+        vulnerabilities = self.report_data['vulnerabilities']
+        severities = Counter((v.get('results') or {}).get('severity') for v in vulnerabilities)
+        total_vulns = len(vulnerabilities)
+        critical = severities['critical']
+        high = severities['high']
+        medium = severities['medium']
+        low = severities['low']
         
         return {
             'total_vulnerabilities': total_vulns,
@@ -55,10 +66,13 @@ class SecurityReportGenerator:
         """Generate security recommendations."""
         recommendations = []
         
-        # Check for common issues and provide recommendations
-        vuln_types = [v.get('scan_type', '') for v in self.report_data['vulnerabilities']]
+        # Check for common issues against the distinct scan types in the report
+        scan_types = {str(v.get('scan_type') or '').lower() for v in self.report_data['vulnerabilities']}
+        
+        def has_scan_type(keyword: str) -> bool:
+            return any(keyword in scan_type for scan_type in scan_types)
         
-        if 'ssl' in str(vuln_types).lower():
+        if has_scan_type('ssl'):
             recommendations.append({
                 'category': 'SSL/TLS',
                 'priority': 'High',
@@ -66,7 +80,7 @@ class SecurityReportGenerator:
                 'action': 'Implement TLS 1.2+ and disable weak ciphers'
             })
         
-        if 'sql' in str(vuln_types).lower():
+        if has_scan_type('sql'):
             recommendations.append({
                 'category': 'Database Security',
                 'priority': 'Critical',
@@ -74,7 +88,7 @@ class SecurityReportGenerator:
                 'action': 'Review and fix SQL injection vulnerabilities'
             })
         
-        if 'port' in str(vuln_types).lower():
+        if has_scan_type('port'):
             recommendations.append({
                 'category': 'Network Security',
                 'priority': 'Medium',
@@ -88,8 +102,13 @@ class SecurityReportGenerator:
         """Generate HTML security report."""
         summary = self.generate_summary()
         recommendations = self.generate_recommendations()
+        generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        html = f"""
+        # Collect fragments and join once at the end
+        parts = []
+        append = parts.append
+        
+        append(f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -109,7 +128,7 @@ class SecurityReportGenerator:
 <body>
     <div class="header">
         <h1>Security Assessment Report</h1>
-        <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Generated on: {generated_on}</p>
     </div>
     
     <div class="summary">
@@ -121,42 +140,43 @@ class SecurityReportGenerator:
     </div>
     
     <h2>Vulnerabilities</h2>
-    """
+    """)
         
         for vuln in self.report_data['vulnerabilities']:
-            severity = vuln.get('results', {}).get('severity', 'unknown')
-            html += f"""
+            results = vuln.get('results') or {}
+            severity = results.get('severity', 'unknown')
+            append(f"""
     <div class="vulnerability {severity}">
         <h3>{vuln.get('scan_type', 'Unknown')}</h3>
         <p><strong>Severity:</strong> {severity.upper()}</p>
-        <p><strong>Details:</strong> {vuln.get('results', {}).get('description', 'No description available')}</p>
+        <p><strong>Details:</strong> {results.get('description', 'No description available')}</p>
     </div>
-    """
+    """)
         
-        html += """
+        append("""
     <h2>Recommendations</h2>
-    """
+    """)
         
         for rec in recommendations:
-            html += f"""
+            append(f"""
     <div class="recommendation">
         <h3>{rec['category']} - {rec['priority']} Priority</h3>
         <p><strong>Recommendation:</strong> {rec['recommendation']}</p>
         <p><strong>Action:</strong> {rec['action']}</p>
     </div>
-    """
+    """)
         
-        html += """
+        append("""
 </body>
 </html>
-"""
-        return html
+""")
+        return ''.join(parts)
     
     def save_report(self, filename: str, format_type: str = 'json'):
         """Save report to file."""
         if format_type == 'json':
-            with open(filename, 'w') as f:
-                json.dump(self.report_data, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(dumps_report(self.report_data))
         elif format_type == 'html':
             html_content = self.generate_html_report()
             with open(filename, 'w') as f:
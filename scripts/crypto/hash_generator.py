@@ -7,9 +7,16 @@ License: MIT
 
 import hashlib
 import argparse
+import mmap
+import os
+import stat
 import sys
 from typing import Dict, List
 
+# Read size used when streaming files through the hash functions;
+# regular files at least this large are memory-mapped instead
+CHUNK_SIZE = 1 << 20
+
 class HashGenerator:
     """Generate hashes using multiple algorithms."""
     
@@ -23,25 +30,56 @@ class HashGenerator:
             'blake2s': hashlib.blake2s
         }
     
-    def generate_hash(self, data: str, algorithm: str) -> str:
-        """Generate hash for given data and algorithm."""
+    def hash_bytes(self, data: bytes, algorithm: str) -> str:
+        """Generate hash for given raw bytes and algorithm."""
         if algorithm not in self.algorithms:
             raise ValueError(f"Unsupported algorithm: {algorithm}")
         
-        hash_obj = self.algorithms[algorithm]()
-        hash_obj.update(data.encode('utf-8'))
-        return hash_obj.hexdigest()
+        return self.algorithms[algorithm](data).hexdigest()
+    
+    def generate_hash(self, data: str, algorithm: str) -> str:
+        """Generate hash for given data and algorithm."""
+        return self.hash_bytes(data.encode('utf-8'), algorithm)
     
     def generate_all_hashes(self, data: str) -> Dict[str, str]:
         """Generate hashes using all supported algorithms."""
+        # Encode once and feed the same buffer to every algorithm
+        data_bytes = data.encode('utf-8')
         results = {}
-        for algorithm in self.algorithms:
+        for algorithm, hash_func in self.algorithms.items():
             try:
-                results[algorithm] = self.generate_hash(data, algorithm)
+                results[algorithm] = hash_func(data_bytes).hexdigest()
             except Exception as e:
                 results[algorithm] = f"Error: {str(e)}"
         return results
     
+    def hash_file(self, path: str, algorithm: str) -> str:
+        """Generate hash for a file without loading it into memory."""
+        if algorithm not in self.algorithms:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        
+        return self._digest_file(path, [algorithm])[algorithm]
+    
+    def hash_file_all(self, path: str) -> Dict[str, str]:
+        """Generate hashes of a file using all supported algorithms in one pass."""
+        return self._digest_file(path, list(self.algorithms))
+    
+    def _digest_file(self, path: str, algorithms: List[str]) -> Dict[str, str]:
+        """Feed a file to several hash functions, reading each page only once."""
+        hash_objs = {algorithm: self.algorithms[algorithm]() for algorithm in algorithms}
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if stat.S_ISREG(st.st_mode) and st.st_size >= CHUNK_SIZE:
+                # Large regular file: hash straight from the page cache via a shared map
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for hash_obj in hash_objs.values():
+                        hash_obj.update(mm)
+            else:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    for hash_obj in hash_objs.values():
+                        hash_obj.update(chunk)
+        return {algorithm: hash_obj.hexdigest() for algorithm, hash_obj in hash_objs.items()}
+    
     def verify_hash(self, data: str, hash_value: str, algorithm: str) -> bool:
         """Verify if hash matches the data."""
         try:
@@ -64,16 +102,28 @@ def main():
     
     generator = HashGenerator()
     
-    # Read data from file if specified
     if args.file:
+        # Hash the raw file bytes without decoding them
         try:
-            with open(args.file, 'rb') as f:
-                data = f.read().decode('utf-8')
-        except Exception as e:
+            if args.verify:
+                hash_value = generator.hash_file(args.file, args.algorithm)
+                is_valid = hash_value.lower() == args.verify.lower()
+                print(f"Hash verification: {'✓ Valid' if is_valid else '✗ Invalid'}")
+            elif args.all:
+                results = generator.hash_file_all(args.file)
+                print(f"Hash results for: {args.file}")
+                print("-" * 60)
+                for algorithm, hash_value in results.items():
+                    print(f"{algorithm.upper():>8}: {hash_value}")
+            else:
+                hash_value = generator.hash_file(args.file, args.algorithm)
+                print(f"{args.algorithm.upper()}: {hash_value}")
+        except OSError as e:
             print(f"Error reading file: {e}")
             sys.exit(1)
-    else:
-        data = args.data
+        return
+    
+    data = args.data
     
     if args.verify:
         # Verify mode
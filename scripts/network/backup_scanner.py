@@ -7,19 +7,61 @@ No massive lists - just smart pattern matching.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import json
 import time
+from itertools import islice, product
 from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor
 
+# Common backup locations, base filenames and extensions
+BACKUP_PATHS = ('/backup/', '/backups/', '/db/', '/database/', '/dump/', '/sql/', '/data/', '/files/', '/downloads/', '/admin/', '/wp-content/', '/includes/', '/config/', '/temp/', '/tmp/', '/logs/', '/var/', '/home/', '/root/')
+BACKUP_FILENAMES = ('backup', 'database', 'db', 'dump', 'data', 'sql')
+BACKUP_EXTENSIONS = ('sql', 'db', 'sqlite', 'sqlite3', 'tar.gz', 'zip', '7z', 'rar', 'bak', 'dump')
+MAX_BACKUP_URLS = 100  # Limit to prevent too many requests
+MAX_WORKERS = 10
+SAMPLE_SIZE = 1024  # Bytes fetched from each candidate for classification and analysis
+
+# Exact media types of backup files, checked before falling back to the fragment scan
+BACKUP_MEDIA_TYPES = frozenset({
+    'application/octet-stream', 'application/sql', 'application/zip',
+    'application/x-rar', 'application/x-rar-compressed', 'application/x-7z-compressed',
+})
+
+# Content-type fragments that indicate a backup file, matched in a single pass
+BACKUP_CONTENT_TYPE = re.compile('|'.join(map(re.escape, (
+    'sql', 'database', 'octet-stream', 'application/zip', 'application/x-rar', 'application/x-7z'
+))))
+
+# Sensitive data patterns, compiled once per process and run directly on raw bytes.
+# Keyword patterns are written in lowercase and run against the lowercased sample
+# instead of using re.IGNORECASE.
+SENSITIVE_PATTERNS = [
+    (name, re.compile(pattern), lowercase)
+    for name, pattern, lowercase in (
+        ('emails', rb'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b', False),
+        ('passwords', rb'password["\']?\s*[:=]\s*["\']?[^"\']+["\']?', True),
+        ('api_keys', rb'api[_-]?key["\']?\s*[:=]\s*["\']?[a-z0-9_-]+["\']?', True),
+        ('tokens', rb'token["\']?\s*[:=]\s*["\']?[a-z0-9_-]+["\']?', True),
+        ('credit_cards', rb'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', False),
+        ('ssn', rb'\b\d{3}-\d{2}-\d{4}\b', False),
+        ('phone', rb'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', False),
+    )
+]
+
 class BackupScanner:
     def __init__(self):
         self.session = requests.Session()
+        # Size the keep-alive pool to the worker count so every probe reuses a connection
+        adapter = HTTPAdapter(pool_maxsize=MAX_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.found_backups = []
+        self.samples = {}
     
     def scan_target(self, target):
         """Scan target for database backups"""
@@ -29,11 +71,15 @@ class BackupScanner:
         backup_urls = self.generate_backup_urls(target)
         
         # Test URLs in parallel
-        with ThreadPoolExecutor(max_workers=10) as executor:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
             results = list(executor.map(self.test_backup_url, backup_urls))
         
-        # Filter successful results
-        found_backups = [url for url, success in zip(backup_urls, results) if success]
+        # Filter successful results, keeping the sample fetched by the probe
+        found_backups = []
+        for url, sample in zip(backup_urls, results):
+            if sample is not None:
+                found_backups.append(url)
+                self.samples[url] = sample
         
         if found_backups:
             print(f"🚨 FOUND {len(found_backups)} DATABASE BACKUPS!")
@@ -44,120 +90,81 @@ class BackupScanner:
         
         return found_backups
     
-    def generate_backup_urls(self, target):
+    def generate_backup_urls(self, target, limit=MAX_BACKUP_URLS):
         """Generate backup URLs using efficient patterns"""
-        urls = []
-        
         # Ensure target has protocol
         if not target.startswith('http'):
             target = f"https://{target}"
         
-        # Common backup paths
-        paths = ['/backup/', '/backups/', '/db/', '/database/', '/dump/', '/sql/', '/data/', '/files/', '/downloads/', '/admin/', '/wp-content/', '/includes/', '/config/', '/temp/', '/tmp/', '/logs/', '/var/', '/home/', '/root/']
-        
-        # Backup filename patterns using regex
-        backup_patterns = [
-            r'backup\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'database\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'db\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'dump\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'data\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'sql\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)',
-            r'\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)$'
-        ]
-        
-        # Generate URLs for each path and pattern
-        for path in paths:
-            for pattern in backup_patterns:
-                # Extract extensions from pattern
-                extensions = re.findall(r'\.(sql|db|sqlite|sqlite3|tar\.gz|zip|7z|rar|bak|dump)', pattern)
-                
-                for ext in extensions:
-                    # Generate common backup filenames
-                    filenames = ['backup', 'database', 'db', 'dump', 'data', 'sql', 'backup_' + time.strftime('%Y%m%d'), 'backup_' + time.strftime('%Y%m%d_%H%M%S')]
-                    
-                    for filename in filenames:
-                        url = f"{target}{path}{filename}.{ext}"
-                        urls.append(url)
-        
-        # Remove duplicates and limit
-        urls = list(set(urls))[:100]  # Limit to prevent too many requests
-        
-        return urls
+        # Add dated variants of the backup filename from a single clock read
+        now = time.localtime()
+        filenames = BACKUP_FILENAMES + (
+            'backup_' + time.strftime('%Y%m%d', now),
+            'backup_' + time.strftime('%Y%m%d_%H%M%S', now),
+        )
+        
+        # Every combination is unique, no dedupe needed. Paths vary fastest so the cap
+        # reaches every directory with the likeliest names before trying rarer ones
+        combos = product(filenames, BACKUP_EXTENSIONS, BACKUP_PATHS)
+        return [f"{target}{path}{filename}.{ext}" for filename, ext, path in islice(combos, limit)]
     
     def test_backup_url(self, url):
-        """Test if backup URL is accessible"""
+        """Test if backup URL is accessible, returning a sample of its content"""
         try:
-            response = self.session.head(url, timeout=5, allow_redirects=True)
-            
-            if response.status_code == 200:
-                # Check if it's actually a backup file
-                content_type = response.headers.get('content-type', '').lower()
-                
-                # Check for backup file indicators
-                backup_indicators = ['sql', 'database', 'octet-stream', 'application/zip', 'application/x-rar', 'application/x-7z']
-                
-                if any(indicator in content_type for indicator in backup_indicators):
-                    return True
+            # A single ranged GET confirms existence and fetches the sample
+            response = self.session.get(url, headers={'Range': f'bytes=0-{SAMPLE_SIZE - 1}'},
+                                        timeout=5, stream=True)
+            try:
+                if response.status_code in (200, 206):
+                    # Check if it's actually a backup file
+                    content_type = response.headers.get('content-type', '').lower()
                     
-                # Check content length (backup files are usually large)
-                content_length = response.headers.get('content-length')
-                if content_length and int(content_length) > 1024:  # > 1KB
-                    return True
+                    # Check for backup file indicators, then size (backup files are usually large)
+                    media_type = content_type.split(';', 1)[0].strip()
+                    if (media_type in BACKUP_MEDIA_TYPES or BACKUP_CONTENT_TYPE.search(content_type)
+                            or self._resource_size(response) > 1024):
+                        return response.raw.read(SAMPLE_SIZE, decode_content=True)
+            finally:
+                response.close()
                     
         except Exception:
             pass
         
-        return False
-    
-    def download_backup_sample(self, backup_url, max_size=1024):
-        """Download a small sample of the backup file"""
-        try:
-            response = self.session.get(backup_url, timeout=10, stream=True)
-            
-            if response.status_code == 200:
-                # Read only first part of file
-                content = b''
-                for chunk in response.iter_content(chunk_size=1024):
-                    content += chunk
-                    if len(content) >= max_size:
-                        break
-                
-                return content
-                
-        except Exception as e:
-            print(f"⚠️ Error downloading backup: {e}")
-        
         return None
     
+    @staticmethod
+    def _resource_size(response):
+        """Total size of the resource behind a (possibly partial) response"""
+        # Partial responses carry the full size in "Content-Range: bytes 0-1023/<total>"
+        total = response.headers.get('content-range', '').rpartition('/')[2]
+        if total.isdigit():
+            return int(total)
+        
+        content_length = response.headers.get('content-length', '')
+        return int(content_length) if content_length.isdigit() else 0
+    
     def analyze_backup_content(self, content):
         """Analyze backup content for sensitive data"""
         if not content:
             return None
         
-        # Convert to string for analysis
-        try:
-            text = content.decode('utf-8', errors='ignore')
-        except:
-            text = str(content)
-        
-        # Look for sensitive data patterns
-        sensitive_patterns = {
-            'emails': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            'passwords': r'password["\']?\s*[:=]\s*["\']?[^"\']+["\']?',
-            'api_keys': r'api[_-]?key["\']?\s*[:=]\s*["\']?[A-Za-z0-9_-]+["\']?',
-            'tokens': r'token["\']?\s*[:=]\s*["\']?[A-Za-z0-9_-]+["\']?',
-            'credit_cards': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-            'ssn': r'\b\d{3}-\d{2}-\d{4}\b',
-            'phone': r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        }
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        
+        # bytes.lower() only folds ASCII, so offsets line up with the original sample
+        content_lc = content.lower()
         
         findings = {}
         
-        for category, pattern in sensitive_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for category, pattern, lowercase in SENSITIVE_PATTERNS:
+            if lowercase:
+                # Report the original casing of each match
+                matches = [content[m.start():m.end()] for m in pattern.finditer(content_lc)]
+            else:
+                matches = pattern.findall(content)
             if matches:
-                findings[category] = matches[:5]  # Limit to first 5 matches
+                # Limit to first 5 matches, decoded only for reporting
+                findings[category] = [m.decode('utf-8', errors='ignore') for m in matches[:5]]
         
         return findings
     
@@ -178,8 +185,8 @@ class BackupScanner:
             for backup in backups[:3]:  # Analyze first 3 backups
                 print(f"\n📁 Analyzing: {backup}")
                 
-                # Download sample
-                sample = self.download_backup_sample(backup)
+                # Sample was fetched while probing the URL
+                sample = self.samples.get(backup)
                 
                 if sample:
                     # Analyze content
@@ -8,104 +8,280 @@ License: MIT
 import socket
 import threading
 import argparse
+import asyncio
 import time
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Tuple
+import struct
+import errno
+import selectors
+import functools
+from collections import deque
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import orjson
+except ImportError:  # Optional, see requirements.txt
+    orjson = None
+
+def dumps_report(report):
+    """Serialize a report to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+
+# SO_LINGER {on, 0s}: close() sends RST instead of FIN, so probes leave no TIME_WAIT state
+LINGER_RESET = struct.pack('ii', 1, 0)
+
+# connect_ex codes meaning a non-blocking connect is still in progress
+CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, 10035}  # 10035: WSAEWOULDBLOCK
+
+# File descriptors left free for the rest of the process when sizing the selector window
+RESERVED_FDS = 256
 
 class PortScanner:
     """Fast and efficient port scanner with concurrent scanning capabilities."""
     
+    # Common ports and their services, also the port list for scan_common_ports
+    _SERVICES = {
+        21: 'FTP', 22: 'SSH', 23: 'Telnet', 25: 'SMTP', 53: 'DNS',
+        80: 'HTTP', 110: 'POP3', 143: 'IMAP', 443: 'HTTPS', 993: 'IMAPS',
+        995: 'POP3S', 3389: 'RDP', 5432: 'PostgreSQL', 3306: 'MySQL',
+        6379: 'Redis', 27017: 'MongoDB', 9200: 'Elasticsearch'
+    }
+    
     def __init__(self, target: str, timeout: float = 1.0, max_threads: int = 100):
         self.target = target
         self.timeout = timeout
-        self.max_threads = max_threads
+        self.max_threads = max_threads  # Maximum number of connections in flight
+        self._target_ip = self._resolve(target)
         self.open_ports = []
-        self.scan_results = []
+        self.scan_results = []  # Open and error results only
+        self.closed_count = 0   # Closed ports are counted, not stored
+        self.scan_start = None
+        self.scan_end = None
     
-    def scan_port(self, port: int) -> Dict:
-        """Scan a single port and return results."""
+    @staticmethod
+    def _resolve(target: str) -> str:
+        """Resolve the target once so probes connect to an IP without per-port DNS."""
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            return socket.gethostbyname(target)
+        except OSError:
+            # Leave unresolved; each probe then reports the resolution failure
+            return target
+    
+    def record_result(self, result: Optional[Dict]) -> None:
+        """Keep an open/error result, or count a closed port."""
+        if result is None:
+            self.closed_count += 1
+        else:
+            self.scan_results.append(result)
+    
+    @staticmethod
+    def _probe_socket() -> socket.socket:
+        """Create a TCP socket for a single probe that is torn down with a reset."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+        return sock
+    
+    def scan_port(self, port: int) -> Optional[Dict]:
+        """Scan a single port and return results, or None if it is closed."""
+        try:
+            sock = self._probe_socket()
             sock.settimeout(self.timeout)
-            result = sock.connect_ex((self.target, port))
+            result = sock.connect_ex((self._target_ip, port))
             sock.close()
             
-            if result == 0:
-                service = self.get_service_name(port)
-                return {
-                    'port': port,
-                    'status': 'open',
-                    'service': service,
-                    'timestamp': time.time()
-                }
-            else:
-                return {
-                    'port': port,
-                    'status': 'closed',
-                    'service': None,
-                    'timestamp': time.time()
-                }
+            if result != 0:
+                return None
+            
+            service = self.get_service_name(port)
+            return {
+                'port': port,
+                'status': 'open',
+                'service': service
+            }
         except Exception as e:
             return {
                 'port': port,
                 'status': 'error',
                 'service': None,
-                'error': str(e),
-                'timestamp': time.time()
+                'error': str(e)
             }
     
-    def get_service_name(self, port: int) -> str:
-        """Get common service name for port."""
-        common_ports = {
-            21: 'FTP', 22: 'SSH', 23: 'Telnet', 25: 'SMTP', 53: 'DNS',
-            80: 'HTTP', 110: 'POP3', 143: 'IMAP', 443: 'HTTPS', 993: 'IMAPS',
-            995: 'POP3S', 3389: 'RDP', 5432: 'PostgreSQL', 3306: 'MySQL',
-            6379: 'Redis', 27017: 'MongoDB', 9200: 'Elasticsearch'
+    async def _scan_port_async(self, port: int) -> Optional[Dict]:
+        """Scan a single port with a non-blocking connect on the running event loop."""
+        try:
+            with self._probe_socket() as sock:
+                sock.setblocking(False)
+                loop = asyncio.get_running_loop()
+                try:
+                    await asyncio.wait_for(loop.sock_connect(sock, (self._target_ip, port)), self.timeout)
+                except socket.gaierror:
+                    raise
+                except (OSError, asyncio.TimeoutError):
+                    # Refused, unreachable or timed out, same as a non-zero connect_ex
+                    return None
+        except Exception as e:
+            return {
+                'port': port,
+                'status': 'error',
+                'service': None,
+                'error': str(e)
+            }
+        
+        return {
+            'port': port,
+            'status': 'open',
+            'service': self.get_service_name(port)
         }
-        return common_ports.get(port, 'Unknown')
     
-    def scan_ports(self, start_port: int, end_port: int) -> List[Dict]:
-        """Scan a range of ports concurrently."""
-        print(f"Scanning {self.target} from port {start_port} to {end_port}")
-        print(f"Using {self.max_threads} threads with {self.timeout}s timeout")
-        
-        ports = list(range(start_port, end_port + 1))
+    async def _scan_all(self, ports) -> List[Dict]:
+        """Scan ports with a fixed number of connection workers sharing one event loop."""
+        port_iter = iter(ports)
         open_ports = []
         
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            future_to_port = {executor.submit(self.scan_port, port): port for port in ports}
-            
-            for future in as_completed(future_to_port):
-                result = future.result()
-                self.scan_results.append(result)
+        async def worker():
+            # Workers pull from the shared iterator until it is exhausted
+            for port in port_iter:
+                result = await self._scan_port_async(port)
+                self.record_result(result)
                 
-                if result['status'] == 'open':
+                if result is not None and result['status'] == 'open':
                     open_ports.append(result)
                     print(f"✓ Port {result['port']} ({result['service']}) is open")
         
+        await asyncio.gather(*(worker() for _ in range(max(1, min(self.max_threads, len(ports))))))
+        return open_ports
+    
+    def _selector_window(self) -> int:
+        """Number of sockets the selector scan keeps in flight."""
+        try:
+            import resource
+            fd_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+            if fd_limit == resource.RLIM_INFINITY:
+                fd_limit = 65536
+        except ImportError:
+            fd_limit = 512  # select() limit on platforms without resource (Windows)
+        return max(1, min(self.max_threads, fd_limit - RESERVED_FDS))
+    
+    def scan_ports_selector(self, ports) -> List[Dict]:
+        """Scan ports from a single thread, multiplexing non-blocking connects on a selector."""
+        window = self._selector_window()
+        print(f"Scanning {self.target} with up to {window} sockets in flight and {self.timeout}s timeout")
+        
+        port_iter = iter(ports)
+        pending = deque()  # (deadline, sock, port) in launch order, so deadlines are ascending
+        open_ports = []
+        
+        self.scan_start = time.time()
+        with selectors.DefaultSelector() as selector:
+            def launch():
+                # Top the window back up with new connects
+                while len(selector.get_map()) < window:
+                    port = next(port_iter, None)
+                    if port is None:
+                        return
+                    try:
+                        sock = self._probe_socket()
+                        sock.setblocking(False)
+                        err = sock.connect_ex((self._target_ip, port))
+                    except Exception as e:
+                        self.record_result({
+                            'port': port,
+                            'status': 'error',
+                            'service': None,
+                            'error': str(e)
+                        })
+                        continue
+                    
+                    if err in CONNECT_PENDING:
+                        selector.register(sock, selectors.EVENT_WRITE, port)
+                        pending.append((time.monotonic() + self.timeout, sock, port))
+                    else:
+                        sock.close()
+                        finish(port, err)
+            
+            def finish(port, err):
+                result = None
+                if err == 0:
+                    result = {
+                        'port': port,
+                        'status': 'open',
+                        'service': self.get_service_name(port)
+                    }
+                    open_ports.append(result)
+                    print(f"✓ Port {port} ({result['service']}) is open")
+                self.record_result(result)
+            
+            launch()
+            while pending:
+                for key, _ in selector.select(timeout=max(0.0, pending[0][0] - time.monotonic())):
+                    # Writable means the connect finished; SO_ERROR tells how
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    sock.close()
+                    finish(key.data, err)
+                
+                # Drop finished sockets and expire the ones past their deadline as closed
+                now = time.monotonic()
+                while pending and (pending[0][1].fileno() == -1 or pending[0][0] <= now):
+                    _, sock, port = pending.popleft()
+                    if sock.fileno() != -1:
+                        selector.unregister(sock)
+                        sock.close()
+                        self.record_result(None)
+                
+                launch()
+        self.scan_end = time.time()
+        
+        return sorted(open_ports, key=lambda x: x['port'])
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def get_service_name(port: int) -> str:
+        """Get common service name for port."""
+        return PortScanner._SERVICES.get(port, 'Unknown')
+    
+    def scan_ports(self, start_port: int, end_port: int) -> List[Dict]:
+        """Scan a range of ports concurrently."""
+        print(f"Scanning {self.target} from port {start_port} to {end_port}")
+        return self._scan_concurrently(range(start_port, end_port + 1))
+    
+    def scan_port_list(self, ports) -> List[Dict]:
+        """Scan the given ports concurrently."""
+        ports = list(ports)
+        print(f"Scanning {self.target} on {len(ports)} ports")
+        return self._scan_concurrently(ports)
+    
+    def _scan_concurrently(self, ports) -> List[Dict]:
+        """Run the asyncio scan over ports and record its timing."""
+        print(f"Using {self.max_threads} concurrent connections with {self.timeout}s timeout")
+        
+        self.scan_start = time.time()
+        open_ports = asyncio.run(self._scan_all(ports))
+        self.scan_end = time.time()
+        
         return sorted(open_ports, key=lambda x: x['port'])
     
     def scan_common_ports(self) -> List[Dict]:
         """Scan common ports."""
-        common_ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 993, 995, 3389, 5432, 3306, 6379, 27017, 9200]
-        return self.scan_ports(min(common_ports), max(common_ports))
+        return self.scan_port_list(self._SERVICES)
     
     def generate_report(self) -> Dict:
         """Generate a comprehensive scan report."""
         open_ports = [r for r in self.scan_results if r['status'] == 'open']
-        closed_ports = [r for r in self.scan_results if r['status'] == 'closed']
-        error_ports = [r for r in self.scan_results if r['status'] == 'error']
+        error_count = len(self.scan_results) - len(open_ports)
         
         return {
             'target': self.target,
             'scan_time': time.time(),
-            'total_ports_scanned': len(self.scan_results),
+            'total_ports_scanned': len(self.scan_results) + self.closed_count,
             'open_ports': len(open_ports),
-            'closed_ports': len(closed_ports),
-            'error_ports': len(error_ports),
+            'closed_ports': self.closed_count,
+            'error_ports': error_count,
             'open_ports_list': open_ports,
-            'scan_duration': max([r['timestamp'] for r in self.scan_results]) - min([r['timestamp'] for r in self.scan_results]) if self.scan_results else 0
+            'scan_duration': self.scan_end - self.scan_start if self.scan_start is not None else 0
         }
 
 def main():
@@ -114,7 +290,9 @@ def main():
     parser.add_argument('-p', '--ports', help='Port range to scan (e.g., 1-1000 or 80,443,8080)')
     parser.add_argument('--common', action='store_true', help='Scan only common ports')
     parser.add_argument('--timeout', type=float, default=1.0, help='Connection timeout in seconds')
-    parser.add_argument('--threads', type=int, default=100, help='Number of concurrent threads')
+    parser.add_argument('--threads', type=int, default=100, help='Number of concurrent connections')
+    parser.add_argument('--engine', choices=['asyncio', 'selector'], default='asyncio',
+                       help='Scan engine')
     parser.add_argument('-o', '--output', help='Output file for results (JSON format)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     
@@ -129,15 +307,16 @@ def main():
     elif args.ports:
         if '-' in args.ports:
             start, end = map(int, args.ports.split('-'))
-            open_ports = scanner.scan_ports(start, end)
+            ports = range(start, end + 1)
         else:
             ports = [int(p) for p in args.ports.split(',')]
-            open_ports = []
-            for port in ports:
-                result = scanner.scan_port(port)
-                scanner.scan_results.append(result)
-                if result['status'] == 'open':
-                    open_ports.append(result)
+        
+        if args.engine == 'selector':
+            open_ports = scanner.scan_ports_selector(ports)
+        elif '-' in args.ports:
+            open_ports = scanner.scan_ports(start, end)
+        else:
+            open_ports = scanner.scan_port_list(ports)
     else:
         print("Please specify ports with -p or use --common for common ports")
         return
@@ -147,8 +326,8 @@ def main():
     
     # Output results
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(dumps_report(report))
         print(f"Results saved to {args.output}")
     else:
         print("\n" + "="*50)
@@ -1,24 +1,106 @@
 # tools/ssl_check.py
 # Lightweight SSL check -> outputs JSON (safe, non-exploitative)
-import subprocess, json, sys
+import socket, ssl, json, sys, asyncio, argparse
+
+# Seconds allowed for the TCP connect and the TLS handshake
+TIMEOUT = 5
+
+# Handshakes in flight at once when checking a hosts file
+CONCURRENCY = 64
+
+# One verifying context for every check; loading the CA store is the expensive part
+CONTEXT = ssl.create_default_context()
+
+def format_name(name):
+    """Render a getpeercert() subject/issuer the way openssl prints it"""
+    return ", ".join(f"{key} = {value}" for rdn in name for key, value in rdn)
+
+def verify_failure(e):
+    """Summary for a handshake whose chain did not verify"""
+    return False, f"CONNECTED\nVerify return code: {e.verify_code} ({e.verify_message})"
+
+def summarize(cert, protocol, cipher):
+    """s_client-style summary of a verified handshake"""
+    lines = [
+        "CONNECTED",
+        f"subject={format_name(cert.get('subject', ()))}",
+        f"issuer={format_name(cert.get('issuer', ()))}",
+        f"notBefore={cert.get('notBefore', '')}",
+        f"notAfter={cert.get('notAfter', '')}",
+        f"Protocol  : {protocol}",
+        f"Cipher    : {cipher}",
+        "Verify return code: 0 (ok)",
+    ]
+    return True, "\n".join(lines)
 
 def run_openssl(host):
-    cmd = ["openssl", "s_client", "-connect", f"{host}:443", "-servername", host]
-    p = subprocess.run(cmd, capture_output=True, text=True)
-    return p.stdout + p.stderr
+    """Handshake with host:443 in-process; returns (valid_chain, s_client-style summary)"""
+    try:
+        with socket.create_connection((host, 443), timeout=TIMEOUT) as sock:
+            with CONTEXT.wrap_socket(sock, server_hostname=host) as ssock:
+                return summarize(ssock.getpeercert(), ssock.version(), ssock.cipher()[0])
+    except ssl.SSLCertVerificationError as e:
+        return verify_failure(e)
+    except OSError as e:  # ssl.SSLError, refused connections and timeouts alike
+        return False, f"connect: {e}"
 
-def parse_and_output(host):
-    raw = run_openssl(host)
-    ok = "Verify return code: 0 (ok)" in raw
-    out = {
+def build_result(host, ok, raw):
+    return {
         "host": host,
         "valid_chain": ok,
-        "snippet": raw.replace("\\n", " ")[:2000]
+        "snippet": raw[:2000].replace("\\n", " ")
     }
-    print(json.dumps(out, indent=2))
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def parse_and_output(host):
+    ok, raw = run_openssl(host)
+    print(json.dumps(build_result(host, ok, raw), indent=2))
+
+async def _check(host, sem):
+    """Async twin of run_openssl; the semaphore caps handshakes in flight"""
+    async with sem:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, 443, ssl=CONTEXT, server_hostname=host), TIMEOUT)
+        except ssl.SSLCertVerificationError as e:
+            return verify_failure(e)
+        except (OSError, asyncio.TimeoutError) as e:
+            return False, f"connect: {str(e) or 'timed out'}"
+        ssock = writer.get_extra_info('ssl_object')
+        result = summarize(writer.get_extra_info('peercert'), ssock.version(), ssock.cipher()[0])
+        writer.close()
+        try:
+            await asyncio.wait_for(writer.wait_closed(), TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
+            pass  # The handshake result stands even if the close_notify exchange fails
+        return result
+
+async def check_many(hosts):
+    """Check every host concurrently, printing one JSON line per host as it completes"""
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def check_and_print(host):
+        ok, raw = await _check(host, sem)
+        out = build_result(host, ok, raw)
+        print(json.dumps(out), flush=True)
+        return out
+
+    return await asyncio.gather(*[check_and_print(host) for host in hosts])
+
+def main():
+    parser = argparse.ArgumentParser(description="Lightweight SSL certificate check")
+    parser.add_argument("host", nargs="?", help="Host to check, e.g. example.com")
+    parser.add_argument("--hosts-file", help="File with one host per line, checked concurrently")
+    args = parser.parse_args()
+
+    if args.hosts_file:
+        with open(args.hosts_file) as f:
+            hosts = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        asyncio.run(check_many(hosts))
+    elif args.host:
+        parse_and_output(args.host)
+    else:
         print("Usage: python ssl_check.py example.com")
         sys.exit(1)
-    parse_and_output(sys.argv[1])
+
+if __name__ == "__main__":
+    main()
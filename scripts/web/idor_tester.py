@@ -3,18 +3,40 @@
 IDOR & AUTHORIZATION TESTER - REAL IDOR VULNERABILITY DISCOVERY
 Tests for Insecure Direct Object References and authorization bypasses
 """
-import requests
 import re
 import json
 from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from _http import get_shared_session, get_with_backoff, TIMEOUT
+
+# Probes in flight at once; kept low enough not to trip rate limits or WAFs
+MAX_WORKERS = 20
+
+# Leading bytes of each probe response read and checked; the indicators sit near the top
+MAX_BODY_BYTES = 8192
+
+# UUIDs anywhere in the target URL
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+
+# Lowercased body words suggesting another user's object was returned
+OBJECT_WORDS = (b"user", b"profile")
+
+# Lowercased body words suggesting access was refused; each one absent counts as an indicator
+DENIAL_WORDS = (b"error", b"unauthorized", b"forbidden")
 
 class IDORTester:
     def __init__(self, target_url):
         self.target_url = target_url
-        self.session = requests.Session()
+        self.session = get_shared_session()  # Keep-alive pool reused by every probe against the target
         self.vulnerabilities = []
         
+        # Target URL pieces, parsed once and reused by every probe URL built from them
+        self._parsed = urlparse(target_url)
+        self._base = f"{self._parsed.scheme}://{self._parsed.netloc}"
+        self._path_parts = self._parsed.path.split("/")
+        self._url_parts = target_url.split("/")
+        self._query_params = parse_qs(self._parsed.query)
+        
     def test_all_idor(self):
         """Test all IDOR techniques"""
         print(f"[*] Starting IDOR testing on {self.target_url}")
@@ -32,8 +54,9 @@ class IDORTester:
         print("[*] Testing numeric ID IDOR...")
         
         # Extract numeric IDs from URL
-        ids = self._extract_numeric_ids(self.target_url)
+        ids = self._extract_numeric_ids()
         
+        candidates = {}  # Probe URL -> (parameter, test ID); each distinct URL is sent once
         for id_param, id_value in ids:
             # Test sequential IDs
             test_ids = [
@@ -44,19 +67,21 @@ class IDORTester:
             
             for test_id in test_ids:
                 try:
-                    test_url = self._replace_id_in_url(self.target_url, id_param, str(test_id))
-                    response = self.session.get(test_url, timeout=10)
-                    
-                    if self._check_idor_vulnerability(response, test_id):
-                        self.vulnerabilities.append({
-                            "type": "Numeric ID IDOR",
-                            "severity": "High",
-                            "url": test_url,
-                            "parameter": id_param,
-                            "test_value": test_id
-                        })
+                    test_url = self._replace_id_in_url(id_param, str(test_id))
+                    candidates.setdefault(test_url, (id_param, test_id))
                 except:
                     pass
+        
+        snapshots = self._fetch_all(list(candidates))
+        for (test_url, (id_param, test_id)), snapshot in zip(candidates.items(), snapshots):
+            if snapshot is not None and self._check_idor_vulnerability(*snapshot, test_id):
+                self.vulnerabilities.append({
+                    "type": "Numeric ID IDOR",
+                    "severity": "High",
+                    "url": test_url,
+                    "parameter": id_param,
+                    "test_value": test_id
+                })
     
     def test_uuid_idor(self):
         """Test UUID IDOR"""
@@ -71,22 +96,22 @@ class IDORTester:
             "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
         ]
         
+        # Probe URL -> (parameter, test UUID); every UUID found shares one parameter, so URLs repeat
+        candidates = {}
         for uuid_param, uuid_value in uuids:
             for test_uuid in test_uuids:
-                try:
-                    test_url = self._replace_id_in_url(self.target_url, uuid_param, test_uuid)
-                    response = self.session.get(test_url, timeout=10)
-                    
-                    if self._check_idor_vulnerability(response, test_uuid):
-                        self.vulnerabilities.append({
-                            "type": "UUID IDOR",
-                            "severity": "High",
-                            "url": test_url,
-                            "parameter": uuid_param,
-                            "test_value": test_uuid
-                        })
-                except:
-                    pass
+                candidates.setdefault(self._replace_id_in_url(uuid_param, test_uuid), (uuid_param, test_uuid))
+        
+        snapshots = self._fetch_all(list(candidates))
+        for (test_url, (uuid_param, test_uuid)), snapshot in zip(candidates.items(), snapshots):
+            if snapshot is not None and self._check_idor_vulnerability(*snapshot, test_uuid):
+                self.vulnerabilities.append({
+                    "type": "UUID IDOR",
+                    "severity": "High",
+                    "url": test_url,
+                    "parameter": uuid_param,
+                    "test_value": test_uuid
+                })
     
     def test_object_level_authorization(self):
         """Test object-level authorization"""
@@ -97,9 +122,11 @@ class IDORTester:
         
         for method in methods:
             try:
-                response = self.session.request(method, self.target_url, timeout=10)
+                # Only the status matters, so the body is never downloaded
+                with self.session.request(method, self.target_url, timeout=TIMEOUT, stream=True) as response:
+                    status = response.status_code
                 
-                if response.status_code == 200 and method in ["PUT", "PATCH", "DELETE"]:
+                if status == 200 and method in ["PUT", "PATCH", "DELETE"]:
                     self.vulnerabilities.append({
                         "type": "Object-Level Authorization Bypass",
                         "severity": "Critical",
@@ -120,22 +147,15 @@ class IDORTester:
             "/manage", "/control-panel"
         ]
         
-        parsed = urlparse(self.target_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
+        test_urls = [self._base + path for path in admin_paths]
         
-        for path in admin_paths:
-            try:
-                test_url = base_url + path
-                response = self.session.get(test_url, timeout=10)
-                
-                if response.status_code == 200 and "admin" in response.text.lower():
-                    self.vulnerabilities.append({
-                        "type": "Function-Level Authorization Bypass",
-                        "severity": "Critical",
-                        "url": test_url
-                    })
-            except:
-                pass
+        for test_url, snapshot in zip(test_urls, self._fetch_all(test_urls)):
+            if snapshot is not None and snapshot[0] == 200 and b"admin" in snapshot[1].lower():
+                self.vulnerabilities.append({
+                    "type": "Function-Level Authorization Bypass",
+                    "severity": "Critical",
+                    "url": test_url
+                })
     
     def test_path_traversal_idor(self):
         """Test path traversal IDOR"""
@@ -149,35 +169,43 @@ class IDORTester:
             "../../user/1",
         ]
         
-        for payload in payloads:
-            try:
-                test_url = self.target_url + "/" + payload
-                response = self.session.get(test_url, timeout=10)
-                
-                if self._check_idor_vulnerability(response, payload):
-                    self.vulnerabilities.append({
-                        "type": "Path Traversal IDOR",
-                        "severity": "High",
-                        "url": test_url,
-                        "payload": payload
-                    })
-            except:
-                pass
+        test_urls = [self.target_url + "/" + payload for payload in payloads]
+        
+        for payload, test_url, snapshot in zip(payloads, test_urls, self._fetch_all(test_urls)):
+            if snapshot is not None and self._check_idor_vulnerability(*snapshot, payload):
+                self.vulnerabilities.append({
+                    "type": "Path Traversal IDOR",
+                    "severity": "High",
+                    "url": test_url,
+                    "payload": payload
+                })
+    
+    def _fetch_all(self, urls):
+        """GET every URL concurrently; snapshots in input order, None where the request failed"""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(urls))) as executor:
+            return list(executor.map(self._fetch, urls))
+    
+    def _fetch(self, url):
+        """GET a single probe URL as (status, leading body bytes)"""
+        try:
+            with get_with_backoff(self.session, url, timeout=TIMEOUT, stream=True) as response:
+                return response.status_code, response.raw.read(MAX_BODY_BYTES, decode_content=True)
+        except:
+            return None
     
-    def _extract_numeric_ids(self, url):
-        """Extract numeric IDs from URL"""
+    def _extract_numeric_ids(self):
+        """Extract numeric IDs from the target URL"""
         ids = []
         
         # Extract from path
-        path_parts = urlparse(url).path.split("/")
-        for i, part in enumerate(path_parts):
+        for i, part in enumerate(self._path_parts):
             if part.isdigit():
                 ids.append((f"path_{i}", part))
         
         # Extract from query parameters
-        parsed = urlparse(url)
-        params = parse_qs(parsed.query)
-        for key, values in params.items():
+        for key, values in self._query_params.items():
             for value in values:
                 if value.isdigit():
                     ids.append((key, value))
@@ -186,43 +214,33 @@ class IDORTester:
     
     def _extract_uuids(self, url):
         """Extract UUIDs from URL"""
-        uuids = []
-        uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-        
-        matches = re.findall(uuid_pattern, url, re.IGNORECASE)
-        for match in matches:
-            uuids.append(("uuid", match))
-        
-        return uuids
+        return [("uuid", match) for match in UUID_PATTERN.findall(url)]
     
-    def _replace_id_in_url(self, url, param, new_value):
-        """Replace ID in URL"""
+    def _replace_id_in_url(self, param, new_value):
+        """Replace ID in the target URL"""
         if param.startswith("path_"):
             # Replace in path
-            parts = url.split("/")
+            parts = self._url_parts.copy()
             index = int(param.split("_")[1])
             if index < len(parts):
                 parts[index] = new_value
             return "/".join(parts)
         else:
             # Replace in query parameters
-            parsed = urlparse(url)
-            params = parse_qs(parsed.query)
+            parsed = self._parsed
+            params = dict(self._query_params)
             params[param] = [new_value]
             new_query = urlencode(params, doseq=True)
             return urlunparse((parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment))
     
-    def _check_idor_vulnerability(self, response, test_value):
+    def _check_idor_vulnerability(self, status, body, test_value):
         """Check if IDOR vulnerability exists"""
-        indicators = [
-            response.status_code == 200,
-            len(response.text) > 100,
-            "user" in response.text.lower() or "profile" in response.text.lower(),
-            "error" not in response.text.lower(),
-            "unauthorized" not in response.text.lower(),
-            "forbidden" not in response.text.lower()
-        ]
-        return sum(indicators) >= 4
+        body = body.lower()  # Searched as bytes; no decode or per-check copies
+        # Each indicator that holds adds one to the score
+        score = (status == 200) + (len(body) > 100) + any(word in body for word in OBJECT_WORDS)
+        for word in DENIAL_WORDS:
+            score += word not in body
+        return score >= 4
 
 if __name__ == "__main__":
     import sys
